@@ -3,118 +3,229 @@ import time
 import os
 import requests
 import json
+import copy
+import threading
 import logging
 import subprocess
 import glob
 from datetime import datetime
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QPushButton, QTextEdit, QLabel, 
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QPushButton, QTextEdit, QPlainTextEdit, QLabel, 
                              QSystemTrayIcon, QMenu, QAction, QFileDialog, QMessageBox, QLineEdit, QDialog, QCheckBox, 
-                             QScrollArea, QMenuBar, QProgressBar, QTabWidget, QListWidget, QListWidgetItem, QComboBox, 
+                             QScrollArea, QMenuBar, QProgressBar, QTabWidget, QListWidget, QListWidgetItem, QListView, QComboBox, 
                              QShortcut, QSlider, QSizePolicy, QSpacerItem, QSplitter, QInputDialog, QStyle)
 from PyQt5.QtGui import QIcon, QKeySequence, QFont, QIntValidator, QTextCursor, QDesktopServices
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QEvent, QUrl
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QEvent, QUrl, QFileSystemWatcher
 
 # New imports
 from markdown import markdown as md_to_html
 import shutil # For file backups
-from functools import partial # For connecting signals
+from functools import partial, lru_cache # For connecting signals, markdown render cache
 import re # For parsing recipes
-from collections import deque # For recently used
-import html # For escaping HTML in chat
+from collections import deque, defaultdict, OrderedDict # For recently used, filter rollups, filter cache
 from urllib.parse import urlparse, urljoin # For smarter URL handling
-from llm_client import LLMRequestThread
-from logger import setup_logging
-from config import ConfigWindow, get_base_path, BASE_PATH, CONFIG_FILE, ABOUT_FILE, BACKUP_DIR, APP_VERSION
+from llm_client import LLMRequestThread, close_session
+from logger import setup_logging, flush_logs
+from config import ConfigWindow, get_base_path, atomic_write_bytes, write_config_file, load_config_cached, BASE_PATH, CONFIG_FILE, ABOUT_FILE, BACKUP_DIR, ICON_FILE, APP_VERSION
+
+_RECIPE_LINE_RE = re.compile(r'(\*\*[^:]*):(.*)') # '**Name**: prompt' -> name part, prompt part (split on the first colon)
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\w \-]') # keeps letters, digits, space, '-' and '_' for memory file names
+_HTML_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'}) # same output as html.escape, in one C-level pass
+_HTML_ESCAPE_BR_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '\n': '<br/>'}) # element text only (quotes need no escaping outside attributes), newline -> <br/>
+_MAX_CAPTURE_CHARS = 256 * 1024 # cap on text taken from the clipboard by the hotkey
+_UNREADABLE_MEMORY_HTML = "<p style='color: red;'>Could not read this entry's memory file; editing is disabled.</p>" # shown in place of a reply whose file failed to load
+_HOTKEY_VALID_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789`-=[]\\;',./") # keys accepted as the hotkey's main key
+_RECIPE_BOLD_RE = re.compile(r'\*\*(.*?)\*\*') # first '**bold**' span of a prompt, used as the recipe/command name
+
+# One captured-text/prompt/response record in the memory list (response is None until read back from its file)
+class MemoryEntry:
+    __slots__ = ('captured_text', 'prompt', 'response', 'filename', 'file_path')
+    def __init__(self, captured_text, prompt, response, filename, file_path=None):
+        self.captured_text = captured_text; self.prompt = sys.intern(prompt); self.response = response; self.filename = filename # recipe prompts repeat across entries
+        self.file_path = file_path # full path of the entry's file, fixed when it is created so a later Memory Directory change doesn't move it
+
+# --- Memory file parsing ---
+_MEMORY_CAPTURED_RE = re.compile(r"Captured Text:\n(.*?)\n\nPrompt:", re.DOTALL); _MEMORY_PROMPT_RE = re.compile(r"Prompt:\n(.*?)\n\nLLM Response:", re.DOTALL); _MEMORY_RESPONSE_RE = re.compile(r"LLM Response:\n(.*)", re.DOTALL)
+def parse_memory_file_content(content):
+    cap_text_m = _MEMORY_CAPTURED_RE.search(content); prompt_m = _MEMORY_PROMPT_RE.search(content); response_m = _MEMORY_RESPONSE_RE.search(content)
+    if not (cap_text_m and prompt_m and response_m): return None
+    return cap_text_m.group(1).strip(), prompt_m.group(1).strip(), response_m.group(1).strip()
+def parse_memory_file_head(file_path):
+    # The preview only needs the captured text and prompt, which come before the response; the rest is read only if the header runs long
+    with open(file_path, 'r', encoding='utf-8') as f:
+        head = f.read(4096)
+        if "\n\nLLM Response:\n" not in head: head += f.read()
+    return parse_memory_file_content(head)
 
 # --- Whitespace normalization function ---
 def normalize_whitespace_for_comparison(s):
     if s is None: return ""
     return ' '.join(str(s).split()).strip()
 
+# --- <think> sections become styled divs, rewritten in a single pass ---
+_THINK_RE = re.compile(r'</?think>'); _THINK_MAP = {'<think>': '<div class="think-block">', '</think>': '</div>'}
+def _think_tag_replacement(match): return _THINK_MAP[match.group(0)]
+
+# --- Markdown rendering, memoized so re-opening the same memory entry skips the pure-Python parse ---
+@lru_cache(maxsize=128)
+def _render_markdown(markdown_text):
+    text_for_md = _THINK_RE.sub(_think_tag_replacement, markdown_text)
+    return md_to_html(text_for_md, extensions=['fenced_code', 'tables', 'sane_lists', 'nl2br', 'attr_list'])
+
+# --- Application stylesheets; apply_theme appends the font-size rule ---
+_LIGHT_QSS = """ QMainWindow, QWidget { background-color: #f0f0f0; color: #000000; } QTextEdit, QPlainTextEdit, QLineEdit { background-color: #ffffff; color: #000000; border: 1px solid #cccccc; } QPushButton { background-color: #e0e0e0; color: #000000; border: 1px solid #bbbbbb; padding: 3px 6px; text-align: left; } QPushButton:hover { background-color: #d0d0d0; } QPushButton#groupButton { background-color: #d8d8d8; font-weight: bold; text-align: left; border: 1px solid #b0b0b0; } QComboBox { background-color: #ffffff; color: #000000; border: 1px solid #cccccc; padding: 1px; min-height: 20px; } QTabWidget::pane { border: 1px solid #cccccc; background: #f0f0f0; } QTabBar::tab { background: #e0e0e0; color: #000000; padding: 4px; border: 1px solid #cccccc; border-bottom: none; } QTabBar::tab:selected { background: #f0f0f0; } QScrollArea { background-color: #f0f0f0; border: none; } QScrollBar:vertical { background: #e0e0e0; width: 12px; margin: 0px; } QScrollBar::handle:vertical { background: #c0c0c0; min-height: 20px; border-radius: 6px;} QScrollBar:horizontal { background: #e0e0e0; height: 12px; margin: 0px; } QScrollBar::handle:horizontal { background: #c0c0c0; min-width: 20px; border-radius: 6px;} QMenuBar { background-color: #e0e0e0; color: #000000; } QMenu { background-color: #ffffff; color: #000000; border: 1px solid #cccccc; } QMenu::item:selected { background-color: #0078d7; color: #ffffff; } QLabel, QCheckBox { color: #000000; } QSplitter::handle { background: #cccccc; } QSplitter::handle:hover { background: #bbbbbb; } QDialog { background-color: #f0f0f0; } """
+_DARK_QSS = """ QMainWindow, QWidget { background-color: #2b2b2b; color: #e0e0e0; } QTextEdit, QPlainTextEdit, QLineEdit { background-color: #3c3f41; color: #e0e0e0; border: 1px solid #555555; } QPushButton { background-color: #4a4a4a; color: #e0e0e0; border: 1px solid #5f5f5f; padding: 3px 6px; text-align: left; } QPushButton:hover { background-color: #5a5a5a; } QPushButton#groupButton { background-color: #525252; font-weight: bold; text-align: left; border: 1px solid #666666; } QComboBox { background-color: #3c3f41; color: #e0e0e0; border: 1px solid #555555; selection-background-color: #5a5a5a; padding: 1px; min-height: 20px; } QComboBox QAbstractItemView { background-color: #3c3f41; color: #e0e0e0; selection-background-color: #5a5a5a; border: 1px solid #555555;} QTabWidget::pane { border: 1px solid #555555; background: #2b2b2b; } QTabBar::tab { background: #3c3f41; color: #e0e0e0; padding: 4px; border: 1px solid #555555; border-bottom: none; } QTabBar::tab:selected { background: #2b2b2b; } QScrollArea { background-color: #2b2b2b; border: none; } QScrollBar:vertical { background: #3c3f41; width: 12px; margin: 0px; } QScrollBar::handle:vertical { background: #5a5a5a; min-height: 20px; border-radius: 6px; } QScrollBar:horizontal { background: #3c3f41; height: 12px; margin: 0px; } QScrollBar::handle:horizontal { background: #5a5a5a; min-width: 20px; border-radius: 6px; } QMenuBar { background-color: #3c3f41; color: #e0e0e0; } QMenu { background-color: #3c3f41; color: #e0e0e0; border: 1px solid #555555; } QMenu::item:selected { background-color: #0078d7; color: #ffffff; } QLabel, QCheckBox { color: #e0e0e0; } QSplitter::handle { background: #555555; } QSplitter::handle:hover { background: #666666; } QDialog { background-color: #2b2b2b; } """
+
+# --- Document stylesheet for rich-text areas, built once per (theme, font family, font size) ---
+@lru_cache(maxsize=8)
+def _document_stylesheet(theme, font_family, current_doc_font_size):
+    base_css = f""" body {{ font-family: "{font_family}"; font-size: {current_doc_font_size}pt; margin: 5px; line-height: 1.4; }} p {{ margin: 0.5em 0; }} h1, h2, h3, h4, h5, h6 {{ margin-top: 1em; margin-bottom: 0.5em; font-weight: bold; line-height: 1.2; }} h1 {{ font-size: {current_doc_font_size + 6}pt; }} h2 {{ font-size: {current_doc_font_size + 4}pt; }} h3 {{ font-size: {current_doc_font_size + 2}pt; }} h4 {{ font-size: {current_doc_font_size + 1}pt;}} ul, ol {{ margin-left: 1.5em; padding-left: 0.5em; }} li {{ margin-bottom: 0.3em; }} pre {{ padding: 0.8em; border-radius: 5px; overflow-x: auto; white-space: pre-wrap; word-wrap: break-word; font-family: Consolas, Monaco, 'Andale Mono', 'Ubuntu Mono', monospace; font-size: {max(8, current_doc_font_size -1)}pt; }} code {{ padding: 0.1em 0.3em; border-radius: 3px; font-family: Consolas, Monaco, 'Andale Mono', 'Ubuntu Mono', monospace; font-size: {max(8, current_doc_font_size -1)}pt;}} pre code {{ padding: 0; background-color: transparent; border: none; font-size: inherit; }} blockquote {{ border-left: 3px solid; padding-left: 1em; margin: 0.8em 0; font-style: italic;}} table {{ border-collapse: collapse; width: auto; max-width: 98%; margin: 1em auto; box-shadow: 0 0 3px rgba(0,0,0,0.1); }} th, td {{ border: 1px solid; padding: 0.5em; text-align: left; }} hr {{ border: 0; border-top: 1px solid; margin: 1em 0; }} .think-block {{ border: 1px dashed; border-radius: 5px; padding: 0.8em; margin: 0.8em 0; font-style: italic; opacity: 0.8; }} """
+    if theme == 'Dark': return base_css + f""" body {{ background-color: #3c3f41; color: #e0e0e0; }} h1, h2, h3, h4, h5, h6 {{ color: #79a6dc; border-bottom: 1px solid #4a4a4f; padding-bottom: 0.2em;}} pre {{ background-color: #2a2a2e; color: #d0d0d0; border: 1px solid #4a4a4f; }} code {{ background-color: #2a2a2e; color: #d0d0d0; }} blockquote {{ border-left-color: #557799; color: #b0b0b0; background-color: #404048;}} th, td {{ border-color: #555555; }} th {{ background-color: #45454a; }} hr {{ border-top-color: #555555; }} a {{ color: #82b1ff; }} .think-block {{ background-color: #404048; border-color: #557799; color: #b0b0b0; }} """
+    else: return base_css + f""" body {{ background-color: #ffffff; color: #1e1e1e; }} h1, h2, h3, h4, h5, h6 {{ color: #003366; border-bottom: 1px solid #e0e0e0; padding-bottom: 0.2em; }} pre {{ background-color: #f0f0f0; color: #2e2e2e; border: 1px solid #cccccc; }} code {{ background-color: #f0f0f0; color: #2e2e2e; }} blockquote {{ border-left-color: #cccccc; color: #444444; background-color: #f8f8f8;}} th, td {{ border-color: #cccccc; }} th {{ background-color: #e8e8e8; }} hr {{ border-top-color: #cccccc; }} a {{ color: #007acc; }} .think-block {{ background-color: #f8f8f8; border-color: #ccc; color: #444; }} """
+
+# --- Cheap check used to skip building expensive debug log arguments ---
+def _debug_enabled():
+    return logging.getLogger().isEnabledFor(logging.DEBUG)
+
 # Signal for updating the GUI from the hotkey listener thread
 class HotkeySignal(QThread):
-    text_captured = pyqtSignal(str)
+    capture_requested = pyqtSignal() # the copy keystroke was sent; the GUI thread reads the clipboard (QClipboard is GUI-thread only)
     show_window = pyqtSignal()
     def __init__(self, hotkey_string):
         QThread.__init__(self)
-        self.hotkey_string = hotkey_string
+        self.hotkey_string = hotkey_string; self._stop_event = threading.Event()
         logging.debug(f"HotkeySignal thread initialized with hotkey: {self.hotkey_string}")
     def run(self):
         try:
             import keyboard
+            handle = keyboard.add_hotkey(self.hotkey_string, self._on_hotkey) # keyboard's own hook thread calls back; this thread just sleeps
             logging.debug("Hotkey listener thread started")
-            while True:
-                keyboard.wait(self.hotkey_string)
-                logging.info(f"Hotkey {self.hotkey_string} activated!")
-                keyboard.press_and_release('ctrl+c') 
-                time.sleep(0.15) 
-                try:
-                    clipboard_text = QApplication.clipboard().text()
-                    if clipboard_text is None: clipboard_text = ""; logging.warning("Clipboard returned None")
-                except Exception as e: clipboard_text = ""; logging.error(f"Failed to access clipboard: {e}")
-                logging.debug(f"Captured text: {clipboard_text[:50]}")
-                self.text_captured.emit(clipboard_text)
-                self.show_window.emit()
+            try: self._stop_event.wait()
+            finally: keyboard.remove_hotkey(handle)
+            logging.debug("Hotkey listener thread stopped")
         except ImportError: logging.error("`keyboard` library not installed. Hotkey functionality disabled (or might require sudo on Linux).")
         except Exception as e: logging.error(f"Hotkey listener error: {e}")
+    def _on_hotkey(self):
+        import keyboard
+        logging.info(f"Hotkey {self.hotkey_string} activated!")
+        keyboard.press_and_release('ctrl+c') 
+        time.sleep(0.15) 
+        self.capture_requested.emit()
+        self.show_window.emit()
+    def stop(self):
+        self._stop_event.set() # run() unregisters the hotkey and returns
+
+# Thread that reads the permanent memory directory so startup doesn't block on disk
+class MemoryLoaderThread(QThread):
+    entries_loaded = pyqtSignal(list)
+    def __init__(self, memory_dir):
+        QThread.__init__(self)
+        self.memory_dir = memory_dir
+    def run(self):
+        entries = []
+        try:
+            with os.scandir(self.memory_dir) as dir_entries: memory_files = [e for e in dir_entries if e.name.endswith(".md")]
+            memory_files.sort(key=lambda e: e.stat().st_mtime) # DirEntry caches the stat, no extra syscall per file on Windows
+            for dir_entry in memory_files:
+                file_path = dir_entry.path; filename = dir_entry.name
+                try:
+                    parsed_entry = parse_memory_file_head(file_path)
+                    if parsed_entry: entries.append(MemoryEntry(parsed_entry[0], parsed_entry[1], None, filename, file_path)) # response is read back from disk when first needed
+                    else: logging.warning(f"Could not parse memory file: {filename}. Skipping.")
+                except Exception as e_file: logging.error(f"Error processing memory file {filename}: {e_file}")
+        except Exception as e: logging.error(f"General error loading permanent memory: {e}", exc_info=True)
+        self.entries_loaded.emit(entries)
+
+# Single writer thread for memory files; only the newest pending content per path is written
+class BackgroundFileWriter(QThread):
+    def __init__(self):
+        QThread.__init__(self)
+        self._condition = threading.Condition(); self._pending = {}; self._busy_path = None; self._stopping = False # {path: text, None to delete, or a callable that writes it}
+    def write(self, path, content):
+        with self._condition: self._pending[path] = content; self._condition.notify_all()
+    def delete(self, path): self.write(path, None)
+    def is_pending(self, path):
+        with self._condition: return path in self._pending or path == self._busy_path
+    def drain(self):
+        with self._condition:
+            while self._pending or self._busy_path is not None: self._condition.wait()
+    def stop(self):
+        with self._condition: self._stopping = True; self._condition.notify_all()
+        self.wait() # drains anything still pending before returning
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopping: self._condition.wait()
+                if not self._pending: return
+                path = next(iter(self._pending)); content = self._pending.pop(path); self._busy_path = path
+            try:
+                if content is None:
+                    try: os.remove(path); logging.debug("Deleted file: %s", path)
+                    except FileNotFoundError: pass
+                elif callable(content): content(); logging.debug("Wrote file: %s", path)
+                else: os.makedirs(os.path.dirname(path), exist_ok=True); atomic_write_bytes(path, content.encode('utf-8'), mode=0o644); logging.debug("Wrote file: %s", path)
+            except Exception as e: logging.error(f"Error writing file {path}: {e}")
+            finally:
+                with self._condition: self._busy_path = None; self._condition.notify_all()
 
 
 # Window to display LLM results
 class ResultWindow(QMainWindow):
     def __init__(self, response_text, parent_app, memory_index=None):
         super().__init__(parent_app); self.parent_app = parent_app; self.memory_index = memory_index
-        current_theme = self.parent_app._theme if self.parent_app else "Light"; full_html = ""
+        current_theme = self.parent_app._theme if self.parent_app else "Light"; full_html = ""; memory_unreadable = False
         if parent_app and hasattr(parent_app, '_memory') and memory_index is not None and 0 <= memory_index < len(parent_app._memory):
-            captured_text, prompt, _, _ = parent_app._memory[memory_index] 
-            command_name_match = re.search(r'\*\*(.*?)\*\*', prompt); command_name = command_name_match.group(1) if command_name_match else prompt.split(':')[0].split('\n')[0]
-            self.setWindowTitle(f"CoDude: {html.escape(command_name[:50])}")
-            formatted_response_html = self.parent_app.format_markdown_for_display(response_text)
-            escaped_captured_text = self.parent_app.escape_html_for_manual_construct(captured_text); escaped_command_name_display = html.escape(command_name) 
-            full_html = f"<p><b>Command:</b><br/>{escaped_command_name_display}</p><p><b>Text:</b><br/>{escaped_captured_text}</p><p><b>LLM Reply:</b></p>{formatted_response_html}"
+            memory_entry = parent_app._memory[memory_index]; captured_text, prompt = memory_entry.captured_text, memory_entry.prompt; memory_unreadable = memory_entry.response is None # its file could not be read
+            command_name_match = _RECIPE_BOLD_RE.search(prompt); command_name = command_name_match.group(1) if command_name_match else prompt.split(':')[0].split('\n')[0]
+            escaped_command_name_display = command_name.translate(_HTML_ESCAPE_TABLE); self.setWindowTitle(f"CoDude: {command_name[:50].translate(_HTML_ESCAPE_TABLE)}")
+            full_html = f"<p><b>Command:</b><br/>{escaped_command_name_display}</p><p><b>Text:</b><br/>{captured_text.translate(_HTML_ESCAPE_BR_TABLE)}</p><p><b>LLM Reply:</b></p>{_UNREADABLE_MEMORY_HTML if memory_unreadable else self.parent_app.format_markdown_for_display(response_text)}"
         else:
             self.setWindowTitle("CoDude: LLM Result"); formatted_response_html = self.parent_app.format_markdown_for_display(response_text) if self.parent_app else response_text
             full_html = f"<p><b>LLM Reply:</b></p>{formatted_response_html}"
         self.setGeometry(200, 200, 700, 500); central_widget = QWidget(); self.setCentralWidget(central_widget)
         layout = QVBoxLayout(central_widget); self.response_textedit = QTextEdit(self)
-        self.response_textedit.setReadOnly(False); doc_style = self.parent_app.get_themed_document_stylesheet()
-        self.response_textedit.document().setDefaultStyleSheet(doc_style); self.response_textedit.setHtml(full_html)
-        self.response_textedit.textChanged.connect(self.on_text_changed_by_user_in_window); layout.addWidget(self.response_textedit)
+        self.response_textedit.setReadOnly(memory_unreadable); doc_style = self.parent_app.get_themed_document_stylesheet()
+        self.response_textedit.document().setDefaultStyleSheet(doc_style); self.response_textedit.setPlainText("Rendering…"); self._content_ready = False
+        QTimer.singleShot(0, partial(self._set_content_html, full_html)) # lay out large replies after the window has painted
+        layout.addWidget(self.response_textedit)
         button_layout = QHBoxLayout(); self.export_button = QPushButton("Export to Markdown", self)
         self.export_button.clicked.connect(self.export_to_markdown); button_layout.addWidget(self.export_button)
         self.copy_button = QPushButton("Copy HTML to Clipboard", self); self.copy_button.clicked.connect(self.copy_to_clipboard)
         button_layout.addWidget(self.copy_button); layout.addLayout(button_layout)
         self.setStyleSheet(self.parent_app.dark_stylesheet_base if current_theme == 'Dark' else self.parent_app.light_stylesheet_base)
-    def on_text_changed_by_user_in_window(self): pass 
+    def _set_content_html(self, full_html):
+        self.response_textedit.setHtml(full_html); self._content_ready = True
     def focusOutEvent(self, event):
-        if self.memory_index is not None and self.parent_app: self.parent_app.save_memory_content_change(self.memory_index, self.response_textedit.toHtml())
+        if self._content_ready and self.memory_index is not None and self.parent_app: self.parent_app.save_memory_content_change(self.memory_index, self.response_textedit.toHtml())
         super().focusOutEvent(event)
     def closeEvent(self, event):
-        if self.memory_index is not None and self.parent_app: self.parent_app.save_memory_content_change(self.memory_index, self.response_textedit.toHtml())
+        if self._content_ready and self.memory_index is not None and self.parent_app: self.parent_app.save_memory_content_change(self.memory_index, self.response_textedit.toHtml())
         if self.parent_app and hasattr(self.parent_app, 'result_windows') and self in self.parent_app.result_windows:
             try: self.parent_app.result_windows.remove(self)
             except ValueError: pass 
         super().closeEvent(event)
     def export_to_markdown(self):
         text_to_export = self.response_textedit.toPlainText() 
-        if self.parent_app and self.memory_index is not None and 0 <= self.memory_index < len(self.parent_app._memory): _, _, text_to_export, _ = self.parent_app._memory[self.memory_index] 
+        if self.parent_app and self.memory_index is not None and 0 <= self.memory_index < len(self.parent_app._memory): text_to_export = self.parent_app._memory_response(self.parent_app._memory[self.memory_index]) 
         options = QFileDialog.Options(); file_path, _ = QFileDialog.getSaveFileName(self, "Save LLM Response", "", "Markdown Files (*.md);;Text Files (*.txt);;All Files (*)", options=options)
         if file_path:
             try:
-                with open(file_path, 'w', encoding='utf-8') as f: f.write(text_to_export)
+                with open(file_path, 'wb') as f: f.write(text_to_export.encode('utf-8'))
                 QMessageBox.information(self, "Export Successful", f"Response saved to {file_path}")
             except Exception as e: QMessageBox.critical(self, "Export Error", f"Could not save file: {e}")
-    def copy_to_clipboard(self): QApplication.clipboard().setText(self.response_textedit.toHtml()); QMessageBox.information(self, "Copy Successful", "HTML content copied to clipboard.")
+    def copy_to_clipboard(self): QApplication.clipboard().setText(self.response_textedit.toHtml()); self.statusBar().showMessage("HTML content copied to clipboard.", 2000)
 
 # Custom widget for Memory entries
 class MemoryEntryWidget(QWidget):
+    delete_requested = pyqtSignal()
     def __init__(self, text, filename=None, parent=None):
-        super().__init__(parent); self.filename = filename
+        super().__init__(parent); self.filename = filename; self.list_item = None # set by the owner so one shared slot can find the row
         self.layout = QHBoxLayout(self); self.layout.setContentsMargins(5,5,5,5); self.layout.setSpacing(5)
-        short_text = ' '.join(text.split()[:15]); short_text += '...' if len(text.split()) > 15 else ''
+        parts = text.split(None, 15) # at most 16 parts: split stops after the 15th token however long the capture is
+        short_text = ' '.join(parts[:15]); short_text += '...' if len(parts) > 15 else ''
         self.label = QLabel(short_text, self); self.label.setWordWrap(True); self.label.setMinimumHeight(30)
         self.layout.addWidget(self.label, 1)
         self.delete_button = QPushButton("Del", self); self.delete_button.setFixedWidth(40); self.delete_button.setVisible(False) 
-        self.layout.addWidget(self.delete_button); self.setMouseTracking(True)
+        self.delete_button.clicked.connect(self.delete_requested); self.layout.addWidget(self.delete_button); self.setMouseTracking(True)
     def enterEvent(self, event): self.delete_button.setVisible(True); super().enterEvent(event)
     def leaveEvent(self, event): self.delete_button.setVisible(False); super().leaveEvent(event)
 
@@ -136,13 +247,16 @@ class CoDudeApp(QMainWindow):
     def __init__(self):
         super().__init__(); self._minimized_by_shortcut = False; logging.info("Starting CoDudeApp initialization")
         self.setWindowTitle("CoDude"); self.setGeometry(100, 100, 900, 800); self.setWindowFlags(Qt.Window | Qt.WindowStaysOnTopHint)
-        self._group_states = {}; self._memory = []; self._all_recipes_data = [] 
+        self._group_states = {}; self._memory = deque(); self._all_recipes_data = []; self._recipe_buttons = []; self._recipe_button_pool = []; self._filter_cache = OrderedDict(); self._group_widgets = {}; self._last_query = "" 
         self.result_windows = []; self.textarea_font_sizes = {}; self.results_in_app = False; self.append_mode = False; self.font_size = 10 
         self.permanent_memory = False; self.memory_dir = ""; self.llm_provider = "Local OpenAI-Compatible"; self.llm_url = "http://127.0.0.1:1234" 
         self.openai_api_key = ""; self.llm_model_name = "gpt-3.5-turbo"; self.recipes_file = ""; self._theme = "Light" 
-        self.active_memory_index = None; self._deleting_memory = False; self.splitter_sizes = [250, 350, 300] 
-        self.max_recents = 5; self.max_favorites = 5; self.recently_used_recipes = deque(maxlen=self.max_recents); self.favorite_recipes = [] 
-        self.dark_stylesheet_base = ""; self.light_stylesheet_base = ""
+        self.active_memory_index = None; self._deleting_memory = False; self._skip_delete_confirm = False; self._shown_memory_entry = None; self._results_html_cache = None; self._recipes_cache = None; self._recipes_layout_signature = None; self.splitter_sizes = [250, 350, 300] 
+        self.max_recents = 5; self.max_favorites = 5; self.max_memory = 200; self.recently_used_recipes = deque(maxlen=self.max_recents); self.favorite_recipes = [] 
+        self.dark_stylesheet_base = _DARK_QSS; self.light_stylesheet_base = _LIGHT_QSS; self._last_applied_qss = None; self._config = None
+        self._pending_config_updates = {}; self._config_flush_timer = QTimer(self); self._config_flush_timer.setSingleShot(True); self._config_flush_timer.timeout.connect(self._flush_config)
+        QApplication.instance().aboutToQuit.connect(self._flush_config)
+        self.file_writer = BackgroundFileWriter(); self.file_writer.start(); QApplication.instance().aboutToQuit.connect(self.file_writer.stop); QApplication.instance().aboutToQuit.connect(close_session); QApplication.instance().aboutToQuit.connect(flush_logs)
         central_widget = QWidget(); self.setCentralWidget(central_widget); main_layout = QVBoxLayout(central_widget)
         menubar = QMenuBar(self); self.setMenuBar(menubar); codude_menu = menubar.addMenu("CoDude")
         configure_action = QAction("Configure", self); configure_action.triggered.connect(self.open_config_window); codude_menu.addAction(configure_action)
@@ -154,27 +268,28 @@ class CoDudeApp(QMainWindow):
         left_widget = QWidget(); self.left_layout = QVBoxLayout(left_widget); self.left_layout.setContentsMargins(5,5,5,5); self.left_layout.setSpacing(3)
         search_layout = QHBoxLayout(); search_layout.setSpacing(3); search_layout.addWidget(QLabel("Search:", self))
         self.search_input = QLineEdit(self); self.search_input.setPlaceholderText("Filter recipes..."); self.search_input.setFixedHeight(22)
-        self.search_input.textChanged.connect(self.filter_recipes_display); search_layout.addWidget(self.search_input); self.left_layout.addLayout(search_layout)
+        self._filter_timer = QTimer(self); self._filter_timer.setSingleShot(True); self._filter_timer.setInterval(150); self._filter_timer.timeout.connect(self.filter_recipes_display) # one filter pass per typing burst
+        self.search_input.textChanged.connect(self._filter_timer.start); search_layout.addWidget(self.search_input); self.left_layout.addLayout(search_layout)
         self.recipes_scroll_area = QScrollArea(); self.recipes_scroll_area.setWidgetResizable(True)
         self.recipes_scroll_widget = QWidget(); self.recipe_buttons_layout = QVBoxLayout(self.recipes_scroll_widget)
         self.recipe_buttons_layout.setAlignment(Qt.AlignTop); self.recipe_buttons_layout.setContentsMargins(0,0,0,0); self.recipe_buttons_layout.setSpacing(1)
         self.recipes_scroll_area.setWidget(self.recipes_scroll_widget); self.left_layout.addWidget(self.recipes_scroll_area)
         self.input_mode_combo = QComboBox(self); self.input_mode_combo.addItems(["Custom Input:", "Chat Mode:"]); self.input_mode_combo.setFixedHeight(24)
         self.input_mode_combo.currentTextChanged.connect(self.on_input_mode_changed); self.left_layout.addWidget(self.input_mode_combo)
-        self.custom_input_textedit = QTextEdit(self); self.custom_input_textedit.setToolTip("Enter custom instructions or chat message here (Ctrl+Enter to send).")
+        self.custom_input_textedit = QPlainTextEdit(self); self.custom_input_textedit.setToolTip("Enter custom instructions or chat message here (Ctrl+Enter to send).")
         self.custom_input_textedit.setMaximumHeight(100); self.left_layout.addWidget(self.custom_input_textedit)
         custom_controls_layout = QHBoxLayout(); custom_controls_layout.setSpacing(3); send_custom_button = QPushButton("Send", self); send_custom_button.setFixedHeight(24)
         send_custom_button.clicked.connect(self.send_custom_or_chat_command); custom_controls_layout.addWidget(send_custom_button, 1)
-        custom_font_up = QPushButton("↑", self); custom_font_up.setFixedSize(24, 24); custom_font_up.clicked.connect(lambda: self.adjust_textarea_font(self.custom_input_textedit, 1))
+        custom_font_up = QPushButton("↑", self); custom_font_up.setFixedSize(24, 24); custom_font_up.clicked.connect(self._font_up)
         custom_controls_layout.addWidget(custom_font_up); custom_font_down = QPushButton("↓", self); custom_font_down.setFixedSize(24, 24)
-        custom_font_down.clicked.connect(lambda: self.adjust_textarea_font(self.custom_input_textedit, -1)); custom_controls_layout.addWidget(custom_font_down)
+        custom_font_down.clicked.connect(self._font_down); custom_controls_layout.addWidget(custom_font_down)
         self.left_layout.addLayout(custom_controls_layout); self.splitter.addWidget(left_widget)
         tabs_widget = QWidget(); tabs_layout = QVBoxLayout(tabs_widget); tabs_layout.setContentsMargins(0,0,0,0); right_tabs = QTabWidget(self) 
         captured_widget = QWidget(); captured_layout = QVBoxLayout(captured_widget); captured_layout.addWidget(QLabel("Captured Text:", self))
-        self.captured_text_edit = QTextEdit(self); captured_layout.addWidget(self.captured_text_edit, 1)
+        self.captured_text_edit = QPlainTextEdit(self); captured_layout.addWidget(self.captured_text_edit, 1)
         captured_font_layout = QHBoxLayout(); captured_font_layout.addStretch()
-        cap_font_up = QPushButton("↑",self); cap_font_up.setFixedSize(24,24); cap_font_up.clicked.connect(lambda: self.adjust_textarea_font(self.captured_text_edit,1)); captured_font_layout.addWidget(cap_font_up)
-        cap_font_down = QPushButton("↓",self); cap_font_down.setFixedSize(24,24); cap_font_down.clicked.connect(lambda: self.adjust_textarea_font(self.captured_text_edit,-1)); captured_font_layout.addWidget(cap_font_down)
+        cap_font_up = QPushButton("↑",self); cap_font_up.setFixedSize(24,24); cap_font_up.clicked.connect(self._font_up); captured_font_layout.addWidget(cap_font_up)
+        cap_font_down = QPushButton("↓",self); cap_font_down.setFixedSize(24,24); cap_font_down.clicked.connect(self._font_down); captured_font_layout.addWidget(cap_font_down)
         captured_layout.addLayout(captured_font_layout); right_tabs.addTab(captured_widget, "Captured Text")
         memory_widget = QWidget(); memory_layout = QVBoxLayout(memory_widget)
         memory_header_layout = QHBoxLayout(); memory_header_layout.addWidget(QLabel("CoDude's Memory:", self))
@@ -182,6 +297,9 @@ class CoDudeApp(QMainWindow):
         self.delete_all_memory_button.setMaximumWidth(100); self.delete_all_memory_button.clicked.connect(self.delete_all_memory_entries)
         memory_header_layout.addWidget(self.delete_all_memory_button); memory_layout.addLayout(memory_header_layout)
         self.memory_list = QListWidget(self); self.memory_list.itemDoubleClicked.connect(self.show_memory_entry_from_list_item)
+        self.memory_list.setUniformItemSizes(True); self.memory_list.setLayoutMode(QListView.Batched); self.memory_list.setBatchSize(100) # rows are all MemoryEntryWidgets
+        self.memory_list.setSelectionMode(QListView.ExtendedSelection)
+        delete_memory_shortcut = QShortcut(QKeySequence.Delete, self.memory_list); delete_memory_shortcut.setContext(Qt.WidgetShortcut); delete_memory_shortcut.activated.connect(self.delete_selected_memory_entries)
         memory_layout.addWidget(self.memory_list, 1); right_tabs.addTab(memory_widget, "Memory")
         tabs_layout.addWidget(right_tabs, 1); self.splitter.addWidget(tabs_widget)
         self.results_container = QWidget(); results_layout = QVBoxLayout(self.results_container); results_layout.setContentsMargins(5,5,5,5); results_layout.setSpacing(3)
@@ -192,42 +310,34 @@ class CoDudeApp(QMainWindow):
         results_controls_layout.addWidget(self.append_mode_checkbox); export_results_button = QPushButton("Export", self); export_results_button.setFixedHeight(24); export_results_button.clicked.connect(self.export_results_to_markdown)
         results_controls_layout.addWidget(export_results_button); copy_results_button = QPushButton("Copy HTML", self); copy_results_button.setFixedHeight(24); copy_results_button.clicked.connect(self.copy_results_to_clipboard)
         results_controls_layout.addWidget(copy_results_button); results_controls_layout.addStretch() 
-        res_font_up = QPushButton("↑", self); res_font_up.setFixedSize(24,24); res_font_up.clicked.connect(lambda: self.adjust_textarea_font(self.results_textedit,1))
-        results_controls_layout.addWidget(res_font_up); res_font_down = QPushButton("↓", self); res_font_down.setFixedSize(24,24); res_font_down.clicked.connect(lambda: self.adjust_textarea_font(self.results_textedit,-1))
+        res_font_up = QPushButton("↑", self); res_font_up.setFixedSize(24,24); res_font_up.clicked.connect(self._font_up)
+        results_controls_layout.addWidget(res_font_up); res_font_down = QPushButton("↓", self); res_font_down.setFixedSize(24,24); res_font_down.clicked.connect(self._font_down)
         results_controls_layout.addWidget(res_font_down); results_layout.addLayout(results_controls_layout); self.splitter.addWidget(self.results_container)
-        self.results_container.setVisible(self.results_in_app)
-        if not self.results_in_app and len(self.splitter_sizes) == 3: self.splitter.setSizes([self.splitter_sizes[0], self.splitter_sizes[1] + self.splitter_sizes[2], 0])
-        else: self.splitter.setSizes(self.splitter_sizes)
+        self._font_button_targets = {custom_font_up: self.custom_input_textedit, custom_font_down: self.custom_input_textedit, cap_font_up: self.captured_text_edit,
+                                     cap_font_down: self.captured_text_edit, res_font_up: self.results_textedit, res_font_down: self.results_textedit}
+        for textarea in (self.custom_input_textedit, self.captured_text_edit, self.results_textedit): textarea._font_key = str(id(textarea)) # key into textarea_font_sizes
+        self.results_container.setVisible(self.results_in_app); self._apply_splitter_sizes()
         self.splitter.splitterMoved.connect(self.save_splitter_sizes)
         self.status_bar = self.statusBar(); self.progress_bar = QProgressBar(self); self.progress_bar.setMaximumWidth(200); self.progress_bar.setVisible(False)
         self.status_bar.addPermanentWidget(self.progress_bar)
-        self.tray_icon = QSystemTrayIcon(self); icon_path = os.path.join(BASE_PATH, 'text-analytics.png') 
-        if os.path.exists(icon_path): self.tray_icon.setIcon(QIcon(icon_path))
-        else: self.tray_icon.setIcon(self.style().standardIcon(QStyle.SP_ComputerIcon))
-        self.tray_icon.setToolTip("CoDude"); tray_menu = QMenu()
-        show_action = QAction("Show/Hide", self); show_action.triggered.connect(self.show_hide_window); tray_menu.addAction(show_action); tray_menu.addSeparator()
-        exit_action = QAction("Exit", self); exit_action.triggered.connect(QApplication.instance().quit); tray_menu.addAction(exit_action)
-        self.tray_icon.setContextMenu(tray_menu); self.tray_icon.activated.connect(self.on_tray_icon_activated); self.tray_icon.show()
+        self.tray_icon = None; QTimer.singleShot(0, self._ensure_tray_icon) # built after the first paint, or earlier if minimizing to tray needs it
         self.custom_command_shortcut = QShortcut(QKeySequence("Ctrl+Return"), self); self.custom_command_shortcut.activated.connect(self.send_custom_or_chat_command)
         self.load_recipes_and_populate_list(); self.apply_theme(); self.append_mode_checkbox.setChecked(self.append_mode) 
         self.on_input_mode_changed(self.input_mode_combo.currentText()) 
-        if self.permanent_memory and self.memory_dir and os.path.exists(self.memory_dir): self.load_permanent_memory_entries() 
-        QTimer.singleShot(1000, self.start_hotkey_thread); logging.info("CoDudeApp initialization complete")
+        self.load_permanent_memory_entries() # checks permanent_memory/memory_dir itself
+        self.fs_watcher = QFileSystemWatcher(self); self.fs_watcher.fileChanged.connect(self.on_watched_file_changed); self._update_file_watcher()
+        QTimer.singleShot(0, self.start_hotkey_thread); logging.info("CoDudeApp initialization complete")
 
     def get_themed_document_stylesheet(self):
-        font_family = self.font().family(); current_doc_font_size = self.font_size 
-        base_css = f""" body {{ font-family: "{font_family}"; font-size: {current_doc_font_size}pt; margin: 5px; line-height: 1.4; }} p {{ margin: 0.5em 0; }} h1, h2, h3, h4, h5, h6 {{ margin-top: 1em; margin-bottom: 0.5em; font-weight: bold; line-height: 1.2; }} h1 {{ font-size: {current_doc_font_size + 6}pt; }} h2 {{ font-size: {current_doc_font_size + 4}pt; }} h3 {{ font-size: {current_doc_font_size + 2}pt; }} h4 {{ font-size: {current_doc_font_size + 1}pt;}} ul, ol {{ margin-left: 1.5em; padding-left: 0.5em; }} li {{ margin-bottom: 0.3em; }} pre {{ padding: 0.8em; border-radius: 5px; overflow-x: auto; white-space: pre-wrap; word-wrap: break-word; font-family: Consolas, Monaco, 'Andale Mono', 'Ubuntu Mono', monospace; font-size: {max(8, current_doc_font_size -1)}pt; }} code {{ padding: 0.1em 0.3em; border-radius: 3px; font-family: Consolas, Monaco, 'Andale Mono', 'Ubuntu Mono', monospace; font-size: {max(8, current_doc_font_size -1)}pt;}} pre code {{ padding: 0; background-color: transparent; border: none; font-size: inherit; }} blockquote {{ border-left: 3px solid; padding-left: 1em; margin: 0.8em 0; font-style: italic;}} table {{ border-collapse: collapse; width: auto; max-width: 98%; margin: 1em auto; box-shadow: 0 0 3px rgba(0,0,0,0.1); }} th, td {{ border: 1px solid; padding: 0.5em; text-align: left; }} hr {{ border: 0; border-top: 1px solid; margin: 1em 0; }} .think-block {{ border: 1px dashed; border-radius: 5px; padding: 0.8em; margin: 0.8em 0; font-style: italic; opacity: 0.8; }} """
-        if self._theme == 'Dark': return base_css + f""" body {{ background-color: #3c3f41; color: #e0e0e0; }} h1, h2, h3, h4, h5, h6 {{ color: #79a6dc; border-bottom: 1px solid #4a4a4f; padding-bottom: 0.2em;}} pre {{ background-color: #2a2a2e; color: #d0d0d0; border: 1px solid #4a4a4f; }} code {{ background-color: #2a2a2e; color: #d0d0d0; }} blockquote {{ border-left-color: #557799; color: #b0b0b0; background-color: #404048;}} th, td {{ border-color: #555555; }} th {{ background-color: #45454a; }} hr {{ border-top-color: #555555; }} a {{ color: #82b1ff; }} .think-block {{ background-color: #404048; border-color: #557799; color: #b0b0b0; }} """
-        else: return base_css + f""" body {{ background-color: #ffffff; color: #1e1e1e; }} h1, h2, h3, h4, h5, h6 {{ color: #003366; border-bottom: 1px solid #e0e0e0; padding-bottom: 0.2em; }} pre {{ background-color: #f0f0f0; color: #2e2e2e; border: 1px solid #cccccc; }} code {{ background-color: #f0f0f0; color: #2e2e2e; }} blockquote {{ border-left-color: #cccccc; color: #444444; background-color: #f8f8f8;}} th, td {{ border-color: #cccccc; }} th {{ background-color: #e8e8e8; }} hr {{ border-top-color: #cccccc; }} a {{ color: #007acc; }} .think-block {{ background-color: #f8f8f8; border-color: #ccc; color: #444; }} """
+        return _document_stylesheet(self._theme, self.font().family(), self.font_size)
 
     def format_markdown_for_display(self, markdown_text):
         if markdown_text is None: markdown_text = ""
-        text_for_md = markdown_text.replace('<think>', '<div class="think-block">').replace('</think>', '</div>')
-        return md_to_html(text_for_md, extensions=['fenced_code', 'tables', 'sane_lists', 'nl2br', 'attr_list'])
+        return _render_markdown(markdown_text)
 
     def escape_html_for_manual_construct(self, text):
         if text is None: return ""
-        return html.escape(str(text)).replace("\n", "<br/>")
+        return str(text).translate(_HTML_ESCAPE_BR_TABLE)
 
     def on_input_mode_changed(self, mode_text):
         is_chat_mode = (mode_text == "Chat Mode:")
@@ -236,24 +346,42 @@ class CoDudeApp(QMainWindow):
         if is_chat_mode and self.results_in_app and not self.results_textedit.toPlainText().strip() :
              self.results_textedit.setHtml("<p style='color: grey; font-style: italic;'>Chat mode started. Type your message below.</p>")
 
+    def _schedule_config_save(self, updates_dict, delay_ms=1000):
+        # Coalesces bursts of UI-driven changes (group toggles etc.) into a single config write
+        self._pending_config_updates.update(updates_dict); self._config_flush_timer.start(delay_ms)
+
+    def _flush_config(self):
+        if self._pending_config_updates: self._save_partial_config({})
+
     def _save_partial_config(self, updates_dict):
+        if self._pending_config_updates: # fold in anything still waiting on the debounce timer
+            self._config_flush_timer.stop(); updates_dict = {**self._pending_config_updates, **updates_dict}; self._pending_config_updates = {}
+        # self._config mirrors CONFIG_FILE as last loaded/written, so no need to re-read and re-parse it here
+        if self._config is None: logging.error(f"Config file {CONFIG_FILE} could not be loaded. Config saving aborted."); return
         try:
-            config = {}; 
-            if os.path.exists(CONFIG_FILE):
-                with open(CONFIG_FILE, 'r', encoding='utf-8') as f: 
-                    try: config = json.load(f)
-                    except json.JSONDecodeError as e: logging.error(f"Error decoding config file {CONFIG_FILE}: {e}. Config saving aborted."); return
-            config.update(updates_dict)
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f: json.dump(config, f, indent=4)
+            # Round-trip through JSON so the stored copy can't alias live app state and compares like the file (tuples -> lists)
+            changed_values = {key: value for key, value in ((key, json.loads(json.dumps(value))) for key, value in updates_dict.items()) if self._config.get(key) != value or key not in self._config}
+            if not changed_values: return
+            self._config.update(changed_values)
+            self.file_writer.write(CONFIG_FILE, partial(write_config_file, dict(self._config))) # values are fresh JSON copies, so a shallow snapshot is safe off-thread
         except Exception as e: logging.error(f"Error saving partial config: {e}")
 
+    def _apply_splitter_sizes(self):
+        # Programmatic resizes must not reach save_splitter_sizes and rewrite the config
+        self.splitter.blockSignals(True)
+        if not self.results_in_app and len(self.splitter_sizes) == 3: self.splitter.setSizes([self.splitter_sizes[0], self.splitter_sizes[1] + self.splitter_sizes[2], 0])
+        else: self.splitter.setSizes(self.splitter_sizes)
+        self.splitter.blockSignals(False)
+
     def save_splitter_sizes(self, pos, index):
         try:
             current_sizes = self.splitter.sizes(); min_width = 50
-            if self.results_container.isVisible() and len(current_sizes) == 3: self.splitter_sizes = [max(min_width, s) for s in current_sizes]
-            elif not self.results_container.isVisible() and len(current_sizes) >= 2: self.splitter_sizes = [max(min_width, current_sizes[0]), max(min_width, current_sizes[1]), 0]
+            if self.results_container.isVisible() and len(current_sizes) == 3: new_sizes = [max(min_width, s) for s in current_sizes]
+            elif not self.results_container.isVisible() and len(current_sizes) >= 2: new_sizes = [max(min_width, current_sizes[0]), max(min_width, current_sizes[1]), 0]
             else: logging.warning(f"Splitter unexpected widget count: {len(current_sizes)}. Sizes not saved."); return
-            self._save_partial_config({'splitter_sizes': self.splitter_sizes}); logging.debug(f"Splitter sizes saved: {self.splitter_sizes}")
+            if new_sizes == self.splitter_sizes: return # e.g. dragging against the min-width clamp
+            self.splitter_sizes = new_sizes
+            self._schedule_config_save({'splitter_sizes': self.splitter_sizes}, 300); logging.debug("Splitter sizes queued for saving: %s", self.splitter_sizes) # splitterMoved fires per drag pixel
         except Exception as e: logging.error(f"Error saving splitter sizes: {e}")
 
     def start_hotkey_thread(self):
@@ -261,9 +389,9 @@ class CoDudeApp(QMainWindow):
             hotkey_string = self.load_hotkey_config_string()
             if not hotkey_string: logging.warning("Hotkey string empty/invalid. Listener not started."); return
             if hasattr(self, 'hotkey_thread') and self.hotkey_thread and self.hotkey_thread.isRunning():
-                logging.info("Terminating existing hotkey thread..."); self.hotkey_thread.terminate(); self.hotkey_thread.wait(500) 
+                logging.info("Stopping existing hotkey thread..."); self.hotkey_thread.stop(); self.hotkey_thread.wait(500) 
             self.hotkey_thread = HotkeySignal(hotkey_string)
-            self.hotkey_thread.text_captured.connect(self.update_captured_text_area)
+            self.hotkey_thread.capture_requested.connect(self.capture_clipboard_text)
             self.hotkey_thread.show_window.connect(self.show_hide_window); self.hotkey_thread.start()
             logging.info(f"Hotkey thread started with {hotkey_string}")
         except Exception as e:
@@ -273,16 +401,11 @@ class CoDudeApp(QMainWindow):
     def load_hotkey_config_string(self):
         default_hotkey = 'ctrl+alt+c'; 
         try:
-            config = {}; 
-            if os.path.exists(CONFIG_FILE):
-                with open(CONFIG_FILE, 'r', encoding='utf-8') as f: config = json.load(f)
-            hotkey_cfg = config.get("hotkey", {"ctrl": True, "alt": True, "main_key": "c"})
+            # validate_and_load_config() already parsed the hotkey; don't re-read CONFIG_FILE here
+            hotkey_cfg = getattr(self, 'hotkey_config', None) or {"ctrl": True, "alt": True, "main_key": "c"}
             ctrl = hotkey_cfg.get("ctrl", False); shift = hotkey_cfg.get("shift", False); alt = hotkey_cfg.get("alt", False); main_k = hotkey_cfg.get("main_key", "c").lower().strip()
-            modifiers = []; valid_chars = "abcdefghijklmnopqrstuvwxyz0123456789`-=[]\\;',./"
-            if ctrl: modifiers.append("ctrl"); 
-            if shift: modifiers.append("shift"); 
-            if alt: modifiers.append("alt")
-            if not main_k or len(main_k) != 1 or main_k not in valid_chars: logging.warning(f"Invalid main key '{main_k}', using default {default_hotkey}"); return default_hotkey
+            modifiers = [name for flag, name in ((ctrl, "ctrl"), (shift, "shift"), (alt, "alt")) if flag]
+            if len(main_k) != 1 or main_k not in _HOTKEY_VALID_CHARS: logging.warning(f"Invalid main key '{main_k}', using default {default_hotkey}"); return default_hotkey
             hotkey_str = '+'.join(modifiers + [main_k]) if modifiers else main_k; 
             if not hotkey_str: return default_hotkey
             logging.debug(f"Loaded hotkey string: {hotkey_str}"); return hotkey_str
@@ -290,31 +413,32 @@ class CoDudeApp(QMainWindow):
 
     def validate_and_load_config(self):
         default_recipes_path = os.path.join(BASE_PATH, "recipes.md"); default_memory_path = os.path.join(BASE_PATH, "memory")
-        default_config = { "llm_provider": "Local OpenAI-Compatible", "llm_url": "http://127.0.0.1:1234", "openai_api_key": "", "lmstudio_url": "http://127.0.0.1:1234", "lmstudio_api_key": "", "use_mcp_tools": False, "llm_model_name": "gpt-3.5-turbo", "recipes_file": default_recipes_path, "hotkey": {"ctrl": True, "shift": False, "alt": True, "main_key": "c"}, "logging_level": "Normal", "logging_output": "Both", "theme": "Light", "group_states": {}, "results_display": "Separate Windows", "font_size": 10, "permanent_memory": False, "memory_dir": default_memory_path, "append_mode": False, "textarea_font_sizes": {}, "splitter_sizes": self.splitter_sizes, "llm_timeout": 60, "close_behavior": "Exit", "max_recents": 5, "max_favorites": 5, "recently_used_recipes": [], "favorite_recipes": [] }
+        default_config = { "llm_provider": "Local OpenAI-Compatible", "llm_url": "http://127.0.0.1:1234", "openai_api_key": "", "lmstudio_url": "http://127.0.0.1:1234", "lmstudio_api_key": "", "use_mcp_tools": False, "llm_model_name": "gpt-3.5-turbo", "recipes_file": default_recipes_path, "hotkey": {"ctrl": True, "shift": False, "alt": True, "main_key": "c"}, "logging_level": "Normal", "logging_output": "Both", "theme": "Light", "group_states": {}, "results_display": "Separate Windows", "font_size": 10, "permanent_memory": False, "memory_dir": default_memory_path, "append_mode": False, "textarea_font_sizes": {}, "splitter_sizes": self.splitter_sizes, "llm_timeout": 60, "close_behavior": "Exit", "max_recents": 5, "max_favorites": 5, "max_memory": 200, "recently_used_recipes": [], "favorite_recipes": [] }
         try:
-            logging.debug(f"Validating and loading config from {CONFIG_FILE}"); os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
+            logging.debug("Validating and loading config from %s", CONFIG_FILE); os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
             config_to_load = default_config.copy()
             if os.path.exists(CONFIG_FILE):
                 with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    loaded_config = json.load(f); 
-                    # Copy all keys from loaded config, including new ones not in default
-                    for key in loaded_config: 
-                        config_to_load[key] = loaded_config[key]
+                    loaded_config = json.load(f)
+                config_to_load.update(loaded_config) # all keys from the file, including ones with no default (local_api_token, mcp_plugin_ids, ...)
+                self._config = copy.deepcopy(loaded_config)
             else: 
-                 with open(CONFIG_FILE, 'w', encoding='utf-8') as f: json.dump(default_config, f, indent=4); logging.info(f"Default config file created at {CONFIG_FILE}")
+                 write_config_file(default_config); logging.info(f"Default config file created at {CONFIG_FILE}")
+                 self._config = copy.deepcopy(default_config)
             self.llm_provider = config_to_load['llm_provider']; self.llm_url = config_to_load['llm_url']; self.openai_api_key = config_to_load['openai_api_key']
             self.local_api_token = config_to_load.get('local_api_token', '')
             self.lmstudio_url = config_to_load.get('lmstudio_url', 'http://127.0.0.1:1234')
             self.lmstudio_api_key = config_to_load.get('lmstudio_api_key', '')
-            logging.debug(f"Config keys: {list(config_to_load.keys())}")
-            logging.debug(f"mcp_plugin_ids in config: {'mcp_plugin_ids' in config_to_load}")
             raw_mcp = config_to_load.get('mcp_plugin_ids')
-            logging.debug(f"Raw mcp_plugin_ids value: {repr(raw_mcp)}")
             self.mcp_plugin_ids = raw_mcp if raw_mcp else ''
-            logging.debug(f"Loaded mcp_plugin_ids from config: '{self.mcp_plugin_ids}'")
             # Load the require_usetools_for_tools setting (default to False for backward compatibility)
             self.require_usetools_for_tools = config_to_load.get('require_usetools_for_tools', False)
-            logging.debug(f"Loaded require_usetools_for_tools from config: {self.require_usetools_for_tools}")
+            if _debug_enabled():
+                logging.debug("Config keys: %s", list(config_to_load.keys()))
+                logging.debug("mcp_plugin_ids in config: %s", 'mcp_plugin_ids' in config_to_load)
+                logging.debug("Raw mcp_plugin_ids value: %r", raw_mcp)
+                logging.debug("Loaded mcp_plugin_ids from config: '%s'", self.mcp_plugin_ids)
+                logging.debug("Loaded require_usetools_for_tools from config: %s", self.require_usetools_for_tools)
             self.llm_model_name = config_to_load['llm_model_name']
             self.recipes_file = config_to_load['recipes_file']
             if self.recipes_file and not os.path.isabs(self.recipes_file): self.recipes_file = os.path.join(BASE_PATH, self.recipes_file)
@@ -325,10 +449,14 @@ class CoDudeApp(QMainWindow):
             if self.permanent_memory and self.memory_dir: os.makedirs(self.memory_dir, exist_ok=True)
             self.append_mode = config_to_load.get('append_mode', False); self.textarea_font_sizes = config_to_load.get('textarea_font_sizes', {})
             loaded_splitter_sizes = config_to_load.get('splitter_sizes', self.splitter_sizes)
-            if isinstance(loaded_splitter_sizes, list) and len(loaded_splitter_sizes) == 3 and all(isinstance(s, int) and s >= 0 for s in loaded_splitter_sizes): self.splitter_sizes = loaded_splitter_sizes
+            try: sizes = [int(s) for s in loaded_splitter_sizes] if isinstance(loaded_splitter_sizes, list) and len(loaded_splitter_sizes) == 3 else None # also normalizes hand-edited floats/strings
+            except (TypeError, ValueError): sizes = None
+            if sizes is not None and min(sizes) >= 0: self.splitter_sizes = sizes
             else: logging.warning(f"Invalid splitter_sizes: {loaded_splitter_sizes}. Using default."); self.splitter_sizes = default_config['splitter_sizes']
             self.llm_timeout = config_to_load.get('llm_timeout', 60); self.close_behavior = config_to_load.get('close_behavior', "Exit")
             self.max_recents = config_to_load.get('max_recents', 5); self.max_favorites = config_to_load.get('max_favorites', 5)
+            try: self.max_memory = int(config_to_load.get('max_memory', 200)) # hand-edited "200" or null would break _trim_memory's comparison
+            except (TypeError, ValueError): logging.warning(f"Invalid max_memory: {config_to_load.get('max_memory')}. Using default."); self.max_memory = 200
             self.recently_used_recipes = deque([tuple(item) for item in config_to_load.get('recently_used_recipes', []) if isinstance(item, list) and len(item) == 2], maxlen=self.max_recents if self.max_recents > 0 else None)
             self.favorite_recipes = [tuple(item) for item in config_to_load.get('favorite_recipes', []) if isinstance(item, list) and len(item) == 2]
             logging.debug("Config loaded successfully.")
@@ -337,64 +465,94 @@ class CoDudeApp(QMainWindow):
              for key, value in default_config.items():
                  try: setattr(self, key, value); 
                  except: logging.error(f"Failed to set default for {key}")
+             self.hotkey_config = default_config['hotkey']; self._config = None # leave the broken file alone until the user fixes it
              if not os.path.isabs(self.recipes_file): self.recipes_file = os.path.join(BASE_PATH, self.recipes_file)
         except Exception as e:
             logging.error(f"Config validation/loading failed: {e}. Using defaults.", exc_info=True); QMessageBox.warning(self, "Config Error", f"Invalid config file. Using defaults.\nDetails: {e}")
             for key, value in default_config.items():
                 try: setattr(self, key, value); 
                 except: logging.error(f"Failed to set default for {key}")
+            self.hotkey_config = default_config['hotkey']; self._config = None
             if not os.path.isabs(self.recipes_file): self.recipes_file = os.path.join(BASE_PATH, self.recipes_file)
             try:
-                with open(CONFIG_FILE, 'w', encoding='utf-8') as f: json.dump(default_config, f, indent=4)
+                write_config_file(default_config)
+                self._config = copy.deepcopy(default_config)
             except Exception as save_e: logging.error(f"Failed to write default config after error: {save_e}")
 
     def apply_theme(self):
         try:
-            logging.debug(f"Applying theme: {self._theme} with font size {self.font_size}pt"); app = QApplication.instance(); base_font = QFont(self.font().family(), self.font_size); app.setFont(base_font)
-            self.light_stylesheet_base = f""" QMainWindow, QWidget {{ background-color: #f0f0f0; color: #000000; }} QTextEdit, QLineEdit {{ background-color: #ffffff; color: #000000; border: 1px solid #cccccc; }} QPushButton {{ background-color: #e0e0e0; color: #000000; border: 1px solid #bbbbbb; padding: 3px 6px; text-align: left; }} QPushButton:hover {{ background-color: #d0d0d0; }} QPushButton#groupButton {{ background-color: #d8d8d8; font-weight: bold; text-align: left; border: 1px solid #b0b0b0; }} QComboBox {{ background-color: #ffffff; color: #000000; border: 1px solid #cccccc; padding: 1px; min-height: 20px; }} QTabWidget::pane {{ border: 1px solid #cccccc; background: #f0f0f0; }} QTabBar::tab {{ background: #e0e0e0; color: #000000; padding: 4px; border: 1px solid #cccccc; border-bottom: none; }} QTabBar::tab:selected {{ background: #f0f0f0; }} QScrollArea {{ background-color: #f0f0f0; border: none; }} QScrollBar:vertical {{ background: #e0e0e0; width: 12px; margin: 0px; }} QScrollBar::handle:vertical {{ background: #c0c0c0; min-height: 20px; border-radius: 6px;}} QScrollBar:horizontal {{ background: #e0e0e0; height: 12px; margin: 0px; }} QScrollBar::handle:horizontal {{ background: #c0c0c0; min-width: 20px; border-radius: 6px;}} QMenuBar {{ background-color: #e0e0e0; color: #000000; }} QMenu {{ background-color: #ffffff; color: #000000; border: 1px solid #cccccc; }} QMenu::item:selected {{ background-color: #0078d7; color: #ffffff; }} QLabel, QCheckBox {{ color: #000000; }} QSplitter::handle {{ background: #cccccc; }} QSplitter::handle:hover {{ background: #bbbbbb; }} QDialog {{ background-color: #f0f0f0; }} """
-            self.dark_stylesheet_base = f""" QMainWindow, QWidget {{ background-color: #2b2b2b; color: #e0e0e0; }} QTextEdit, QLineEdit {{ background-color: #3c3f41; color: #e0e0e0; border: 1px solid #555555; }} QPushButton {{ background-color: #4a4a4a; color: #e0e0e0; border: 1px solid #5f5f5f; padding: 3px 6px; text-align: left; }} QPushButton:hover {{ background-color: #5a5a5a; }} QPushButton#groupButton {{ background-color: #525252; font-weight: bold; text-align: left; border: 1px solid #666666; }} QComboBox {{ background-color: #3c3f41; color: #e0e0e0; border: 1px solid #555555; selection-background-color: #5a5a5a; padding: 1px; min-height: 20px; }} QComboBox QAbstractItemView {{ background-color: #3c3f41; color: #e0e0e0; selection-background-color: #5a5a5a; border: 1px solid #555555;}} QTabWidget::pane {{ border: 1px solid #555555; background: #2b2b2b; }} QTabBar::tab {{ background: #3c3f41; color: #e0e0e0; padding: 4px; border: 1px solid #555555; border-bottom: none; }} QTabBar::tab:selected {{ background: #2b2b2b; }} QScrollArea {{ background-color: #2b2b2b; border: none; }} QScrollBar:vertical {{ background: #3c3f41; width: 12px; margin: 0px; }} QScrollBar::handle:vertical {{ background: #5a5a5a; min-height: 20px; border-radius: 6px; }} QScrollBar:horizontal {{ background: #3c3f41; height: 12px; margin: 0px; }} QScrollBar::handle:horizontal {{ background: #5a5a5a; min-width: 20px; border-radius: 6px; }} QMenuBar {{ background-color: #3c3f41; color: #e0e0e0; }} QMenu {{ background-color: #3c3f41; color: #e0e0e0; border: 1px solid #555555; }} QMenu::item:selected {{ background-color: #0078d7; color: #ffffff; }} QLabel, QCheckBox {{ color: #e0e0e0; }} QSplitter::handle {{ background: #555555; }} QSplitter::handle:hover {{ background: #666666; }} QDialog {{ background-color: #2b2b2b; }} """
+            theme_key = (self._theme, self.font_size, tuple(sorted(self.textarea_font_sizes.items())))
+            if theme_key == self._last_applied_qss: return
+            logging.debug("Applying theme: %s with font size %spt", self._theme, self.font_size); app = QApplication.instance(); base_font = QFont(self.font().family(), self.font_size); app.setFont(base_font)
             chosen_stylesheet = self.dark_stylesheet_base if self._theme == 'Dark' else self.light_stylesheet_base; chosen_stylesheet += f" * {{ font-size: {self.font_size}pt; }}" 
-            app.setStyleSheet(chosen_stylesheet); doc_style = self.get_themed_document_stylesheet()
+            app.setStyleSheet(chosen_stylesheet); doc_style = None
             text_areas_to_style = [(self.custom_input_textedit, False), (self.captured_text_edit, False), (self.results_textedit, True)]
             for textarea, is_markdown_view in text_areas_to_style:
-                textarea_id = str(id(textarea)); size_pt = self.textarea_font_sizes.get(textarea_id, self.font_size)
+                size_pt = self.textarea_font_sizes.get(textarea._font_key, self.font_size)
                 font = textarea.font(); font.setPointSize(size_pt); textarea.setFont(font)
                 if is_markdown_view:
-                    textarea.document().setDefaultStyleSheet(doc_style); 
-                    if textarea.toPlainText(): current_html = textarea.toHtml(); textarea.setHtml(current_html) 
-            self.update(); self.repaint(); QApplication.processEvents()
+                    doc_style = doc_style or self.get_themed_document_stylesheet()
+                    if getattr(textarea, '_applied_doc_style', None) == doc_style: continue # CSS unchanged (e.g. only a font size moved): skip the re-parse
+                    textarea.document().setDefaultStyleSheet(doc_style); textarea._applied_doc_style = doc_style
+                    if not textarea.document().isEmpty(): textarea.setHtml(self._results_html() if textarea is self.results_textedit else textarea.toHtml()) # re-parse so existing content picks up the new CSS
+            self._last_applied_qss = theme_key # setStyleSheet/setFont already schedule the repolish and repaint
         except Exception as e: logging.error(f"Error applying theme: {e}", exc_info=True)
 
     def _clear_layout(self, layout):
-        if layout is not None:
-            while layout.count():
-                item = layout.takeAt(0); widget = item.widget()
-                if widget is not None: widget.deleteLater()
-                else:
-                    sub_layout = item.layout()
-                    if sub_layout is not None: self._clear_layout(sub_layout);
+        # Iterative walk; recipe buttons are parked in _recipe_button_pool for _create_recipe_button instead of being destroyed
+        pending_layouts = [layout] if layout is not None else []
+        while pending_layouts:
+            current_layout = pending_layouts.pop()
+            while current_layout.count():
+                item = current_layout.takeAt(0); widget = item.widget()
+                if widget is None:
+                    if item.layout() is not None: pending_layouts.append(item.layout())
+                    continue
+                if widget.layout() is not None: pending_layouts.append(widget.layout()) # salvage buttons from group containers before they are deleted
+                if widget.property("recipe_name") is not None and len(self._recipe_button_pool) < 256:
+                    widget.show(); widget.setParent(None); self._recipe_button_pool.append(widget) # show() clears a filter's explicit hide so the next layout shows it
+                else: widget.deleteLater()
+
+    def _write_recipes_file(self, lines):
+        with open(self.recipes_file, 'w', encoding='utf-8') as f: f.writelines(lines)
+        self._recipes_cache = None # Writes can land within the same mtime tick, so don't rely on stat alone
 
     def _parse_recipes_file_to_structure(self):
         structured_recipes = []; current_group_title = None
-        if not self.recipes_file or not os.path.exists(self.recipes_file): logging.warning(f"Recipes file missing: {self.recipes_file}"); return structured_recipes
+        if not self.recipes_file: logging.warning(f"Recipes file missing: {self.recipes_file}"); return structured_recipes
         try:
-            with open(self.recipes_file, 'r', encoding='utf-8') as f: lines = f.readlines()
-        except Exception as e: logging.error(f"Error reading recipes file {self.recipes_file}: {e}"); return structured_recipes
-        for line_num, line_content in enumerate(lines):
-            line = line_content.strip()
-            if not line: continue
-            if line.startswith('#'): current_group_title = line.lstrip('#').strip(); structured_recipes.append({'type': 'group', 'title': current_group_title, 'line_num': line_num})
-            elif line.startswith('**') and ':' in line:
-                try:
-                    name_part, prompt_part = line.split(':', 1); name = name_part.strip().strip('**').strip(); prompt_from_file = prompt_part.strip()
-                    if name and prompt_from_file: structured_recipes.append({'type': 'recipe', 'name': name, 'prompt': prompt_from_file, 'group_title': current_group_title, 'line_num': line_num, 'id': (name, prompt_from_file)})
-                    else: logging.warning(f"Skipping malformed recipe (line {line_num+1}): {line}")
-                except ValueError: logging.warning(f"Skipping malformed recipe line (line {line_num+1}): {line}")
-        return structured_recipes
+            try: file_stat = os.stat(self.recipes_file)
+            except FileNotFoundError: logging.warning(f"Recipes file missing: {self.recipes_file}"); return structured_recipes
+            cache_key = (self.recipes_file, file_stat.st_mtime_ns, file_stat.st_size)
+            if self._recipes_cache is not None and self._recipes_cache[0] == cache_key: return list(self._recipes_cache[1])
+            with open(self.recipes_file, 'r', encoding='utf-8') as f:
+                for line_num, line_content in enumerate(f):
+                    line = line_content.strip()
+                    if not line: continue
+                    if line[0] == '#': current_group_title = line.lstrip('#').strip(); structured_recipes.append({'type': 'group', 'title': current_group_title, 'line_num': line_num}); continue
+                    recipe_match = _RECIPE_LINE_RE.match(line)
+                    if recipe_match:
+                        name = recipe_match.group(1).strip().strip('*').strip(); prompt_from_file = recipe_match.group(2).strip()
+                        if name and prompt_from_file: structured_recipes.append({'type': 'recipe', 'name': name, 'prompt': prompt_from_file, 'group_title': current_group_title, 'line_num': line_num, 'id': (name, prompt_from_file)})
+                        else: logging.warning(f"Skipping malformed recipe (line {line_num+1}): {line}")
+        except Exception as e: logging.error(f"Error reading recipes file {self.recipes_file}: {e}"); return []
+        self._recipes_cache = (cache_key, structured_recipes)
+        return list(structured_recipes)
 
     def load_recipes_and_populate_list(self):
-        logging.info(f"Loading recipes from: {self.recipes_file}"); self._clear_layout(self.recipe_buttons_layout)
-        self._all_recipes_data = self._parse_recipes_file_to_structure()
+        logging.info("Loading recipes from: %s", self.recipes_file); parsed_recipes = self._parse_recipes_file_to_structure()
+        layout_signature = (tuple((d['type'], d.get('title'), d.get('id')) for d in parsed_recipes), tuple(self.favorite_recipes), tuple(self.recently_used_recipes), self.max_recents) if parsed_recipes else None
+        if layout_signature is not None and layout_signature == self._recipes_layout_signature: logging.debug("Recipes unchanged; keeping existing buttons."); return
+        was_visible = self.recipes_scroll_widget.isVisible(); self.recipes_scroll_widget.setUpdatesEnabled(False) # one repaint for the whole rebuild instead of one per button
+        if was_visible: self.recipes_scroll_widget.hide() # hidden parent: adding children skips per-widget polish/relayout until show()
+        try: self._populate_recipe_buttons(parsed_recipes, layout_signature)
+        finally:
+            if was_visible: self.recipes_scroll_widget.show()
+            self.recipes_scroll_widget.setUpdatesEnabled(True)
+
+    def _populate_recipe_buttons(self, parsed_recipes, layout_signature):
+        self._clear_layout(self.recipe_buttons_layout); self._all_recipes_data = parsed_recipes; self._recipes_layout_signature = layout_signature
+        self._recipe_buttons = []; self._filter_cache.clear(); self._group_widgets = {}; self._last_query = ""
         if not self._all_recipes_data and (not self.recipes_file or not os.path.exists(self.recipes_file)):
             if not self.recipes_file or not os.path.exists(self.recipes_file):
                 reply = QMessageBox.question(self, "Recipes File Missing", f"Recipes file ({self.recipes_file or 'Not Set'}) missing. Download default?", QMessageBox.Yes | QMessageBox.No)
@@ -405,19 +563,20 @@ class CoDudeApp(QMainWindow):
         if self.recently_used_recipes.maxlen != self.max_recents: self.recently_used_recipes = deque(list(self.recently_used_recipes), maxlen=self.max_recents if self.max_recents > 0 else None)
         self._add_virtual_group_to_layout("Recently Used", self.recently_used_recipes)
         self._add_virtual_group_to_layout("Favorites", self.favorite_recipes, is_favorites_group=True)
-        last_group_items_layout = None 
+        last_group_items_layout = None; last_group_container = None
         for item_data in self._all_recipes_data:
             if item_data['type'] == 'group':
                 group_title = item_data['title']; group_button, group_widget_container, group_items_layout = self._create_collapsible_group(group_title)
                 self.recipe_buttons_layout.addWidget(group_button); self.recipe_buttons_layout.addWidget(group_widget_container)
-                last_group_items_layout = group_items_layout 
+                last_group_items_layout = group_items_layout; last_group_container = group_widget_container
             elif item_data['type'] == 'recipe':
                 name, prompt = item_data['name'], item_data['prompt']; is_fav = (name, prompt) in self.favorite_recipes
-                recipe_button = self._create_recipe_button(name, prompt, is_fav)
+                recipe_button = self._create_recipe_button(name, prompt, is_fav, last_group_container)
                 if last_group_items_layout is not None: last_group_items_layout.addWidget(recipe_button) 
                 else: self.recipe_buttons_layout.addWidget(recipe_button); logging.warning(f"Recipe '{name}' added outside group. Check recipes.md.")
-        self.recipe_buttons_layout.addStretch(); self.recipes_scroll_widget.setLayout(self.recipe_buttons_layout) 
+        self.recipe_buttons_layout.addStretch()
         self.recipes_scroll_widget.adjustSize(); self.recipes_scroll_area.updateGeometry()
+        if self.search_input.text(): self.filter_recipes_display(self.search_input.text()) # keep an active search applied to the new buttons
 
     def _add_virtual_group_to_layout(self, group_name, recipe_id_list, is_favorites_group=False):
         effective_list = list(recipe_id_list); 
@@ -427,68 +586,90 @@ class CoDudeApp(QMainWindow):
         self.recipe_buttons_layout.addWidget(group_button); self.recipe_buttons_layout.addWidget(group_widget_container)
         for recipe_name, recipe_prompt_from_file in effective_list:
             is_fav = (recipe_name, recipe_prompt_from_file) in self.favorite_recipes
-            recipe_button = self._create_recipe_button(recipe_name, recipe_prompt_from_file, is_fav)
+            recipe_button = self._create_recipe_button(recipe_name, recipe_prompt_from_file, is_fav, group_widget_container)
             group_items_layout.addWidget(recipe_button)
         if not effective_list: group_items_layout.addStretch()
 
     def _create_collapsible_group(self, title):
         group_button = QPushButton(); group_button.setObjectName("groupButton"); group_button.setCheckable(True)
-        group_button.setStyleSheet("text-align: left; font-weight: bold;") 
         is_expanded = self._group_states.get(title, True); group_button.setChecked(is_expanded)
         group_button.setText(f"{title} {'▼' if is_expanded else '▶'}"); group_button.setFixedHeight(22)
         group_button.setContextMenuPolicy(Qt.CustomContextMenu)
-        group_button.customContextMenuRequested.connect(partial(self.show_group_context_menu, title))
+        group_button.customContextMenuRequested.connect(self._on_group_context_menu_requested)
         group_widget_container = QWidget(); sp = QSizePolicy(QSizePolicy.MinimumExpanding, QSizePolicy.Fixed) 
         group_widget_container.setSizePolicy(sp)
         group_items_layout = QVBoxLayout(group_widget_container) 
         group_items_layout.setContentsMargins(15, 2, 0, 2); group_items_layout.setSpacing(1) 
         group_widget_container.setVisible(is_expanded); 
-        group_button.toggled.connect(lambda checked, gc=group_widget_container, gb=group_button, t=title: self.toggle_group_visibility(checked, gc, gb, t))
+        group_button.toggled.connect(self._on_group_toggled)
+        self._group_widgets[group_button] = (title, group_widget_container)
         return group_button, group_widget_container, group_items_layout
 
-    def _create_recipe_button(self, name, prompt_from_file, is_favorite):
-        button_text = f"[★] {name}" if is_favorite else name; button = QPushButton(button_text); button.setFixedHeight(20)
+    def _create_recipe_button(self, name, prompt_from_file, is_favorite, group_container=None):
+        button_text = f"[★] {name}" if is_favorite else name
+        if self._recipe_button_pool: button = self._recipe_button_pool.pop(); button.setText(button_text) # already wired to the shared slots
+        else:
+            button = QPushButton(button_text); button.setFixedHeight(20); button.clicked.connect(self._on_recipe_button_clicked)
+            button.setContextMenuPolicy(Qt.CustomContextMenu); button.customContextMenuRequested.connect(self._on_recipe_context_menu_requested)
         button.setToolTip(f"Prompt: {prompt_from_file[:100]}{'...' if len(prompt_from_file)>100 else ''}")
-        button.clicked.connect(partial(self.execute_recipe_command, prompt_from_file, name, button))
-        button.setContextMenuPolicy(Qt.CustomContextMenu); button.customContextMenuRequested.connect(partial(self.show_recipe_context_menu, name, prompt_from_file, button))
+        button.setProperty("recipe_name", name); button.setProperty("recipe_prompt", prompt_from_file)
+        self._recipe_buttons.append((button, f"{name}\0{prompt_from_file}".lower(), group_container)) # one lowercased haystack per recipe; NUL keeps matches from spanning name and prompt
         return button
 
+    # Shared slots for every recipe/group button; the button's own data identifies what was clicked
+    def _on_recipe_button_clicked(self):
+        button = self.sender(); self.execute_recipe_command(button.property("recipe_prompt"), button.property("recipe_name"), button)
+
+    def _on_recipe_context_menu_requested(self, point):
+        button = self.sender(); self.show_recipe_context_menu(button.property("recipe_name"), button.property("recipe_prompt"), button, point)
+
+    def _on_group_toggled(self, is_checked):
+        group_button = self.sender(); title, group_container = self._group_widgets[group_button]; self.toggle_group_visibility(is_checked, group_container, group_button, title)
+
+    def _on_group_context_menu_requested(self, point):
+        self.show_group_context_menu(self._group_widgets[self.sender()][0], point)
+
     def toggle_group_visibility(self, is_checked, group_container, group_button, title):
         group_container.setVisible(is_checked)
         sp = group_container.sizePolicy(); sp.setVerticalPolicy(QSizePolicy.Preferred if is_checked else QSizePolicy.Fixed); group_container.setSizePolicy(sp)
-        if group_container.layout(): group_container.layout().invalidate(); group_container.layout().activate()   
         group_container.adjustSize(); group_container.updateGeometry()
-        self._group_states[title] = is_checked; group_button.setText(f"{title} {'▼' if is_checked else '▶'}"); self._save_partial_config({'group_states': self._group_states})
+        self._group_states[title] = is_checked; group_button.setText(f"{title} {'▼' if is_checked else '▶'}"); self._schedule_config_save({'group_states': self._group_states})
         self.recipes_scroll_widget.adjustSize(); self.recipes_scroll_widget.updateGeometry()
-        self.recipes_scroll_area.updateGeometry(); QApplication.processEvents()
+        self.recipes_scroll_area.updateGeometry()
+
+    def filter_recipes_display(self, query=None): 
+        query = (self.search_input.text() if query is None else query).lower()
+        if query == self._last_query: return
+        self._last_query = query; visible_per_group = defaultdict(int); self.recipes_scroll_widget.setUpdatesEnabled(False)
+        try: self._apply_recipe_filter(query, visible_per_group)
+        finally: self.recipes_scroll_widget.setUpdatesEnabled(True)
+        self.recipes_scroll_widget.adjustSize(); self.recipes_scroll_area.updateGeometry()
 
-    def filter_recipes_display(self, query): 
-        query = query.lower(); any_match_found = False
-        for i in range(self.recipe_buttons_layout.count()):
-            top_item = self.recipe_buttons_layout.itemAt(i); 
-            if not top_item: continue
-            widget = top_item.widget()
-            if not widget: continue
-            is_group_container = False
-            group_button_ref = None
-            group_title = None
-            if i > 0:
-                prev_item = self.recipe_buttons_layout.itemAt(i-1)
-                if prev_item and prev_item.widget() and isinstance(prev_item.widget(), QPushButton) and prev_item.widget().objectName() == "groupButton" and isinstance(widget, QWidget) and widget.layout() is not None:
-                    is_group_container = True; group_button_ref = prev_item.widget(); group_title = group_button_ref.text().rsplit(' ',1)[0]
-            if is_group_container:
-                group_layout = widget.layout(); group_has_visible_recipe = False
-                for j in range(group_layout.count()):
-                    recipe_item = group_layout.itemAt(j)
-                    if recipe_item and recipe_item.widget() and isinstance(recipe_item.widget(), QPushButton):
-                        recipe_button = recipe_item.widget(); 
-                        if recipe_button.objectName() == "groupButton": continue
-                        recipe_name = recipe_button.text().lower().replace("[★]", "").strip(); recipe_prompt_tooltip = recipe_button.toolTip().lower().replace("prompt:","").strip()
-                        matches = query in recipe_name or query in recipe_prompt_tooltip; recipe_button.setVisible(matches)
-                        if matches: group_has_visible_recipe = True; any_match_found = True
-                is_expanded = self._group_states.get(group_title, True); widget.setVisible(group_has_visible_recipe and is_expanded); group_button_ref.setVisible(group_has_visible_recipe or not query)
-        if not query: self.load_recipes_and_populate_list(); return
-        self.recipes_scroll_widget.adjustSize(); self.recipes_scroll_area.updateGeometry(); QApplication.processEvents()
+    def _recipe_filter_matches(self, query):
+        # Indices into _recipe_buttons matching query (None = everything). Extending a query can only drop matches,
+        # so only the result cached for its longest cached prefix needs rescanning; the cache is cleared on every rebuild
+        if not query: return None
+        matches = self._filter_cache.get(query)
+        if matches is not None: self._filter_cache.move_to_end(query); return matches
+        candidates = None
+        for prefix_len in range(len(query) - 1, 0, -1):
+            candidates = self._filter_cache.get(query[:prefix_len])
+            if candidates is not None: break
+        recipe_buttons = self._recipe_buttons
+        matches = frozenset(i for i in (candidates if candidates is not None else range(len(recipe_buttons))) if query in recipe_buttons[i][1])
+        self._filter_cache[query] = matches
+        if len(self._filter_cache) > 32: self._filter_cache.popitem(last=False)
+        return matches
+
+    def _apply_recipe_filter(self, query, visible_per_group):
+        matched_indices = self._recipe_filter_matches(query)
+        for index, (recipe_button, _, group_container) in enumerate(self._recipe_buttons):
+            matches = matched_indices is None or index in matched_indices
+            if recipe_button.isHidden() == matches: recipe_button.setVisible(matches)
+            if matches: visible_per_group[group_container] += 1
+        for group_button, (group_title, group_container) in self._group_widgets.items():
+            group_has_visible_recipe = visible_per_group[group_container] > 0; is_expanded = self._group_states.get(group_title, True)
+            group_container.setVisible(is_expanded and (group_has_visible_recipe or not query)); group_button.setVisible(group_has_visible_recipe or not query)
 
     def show_recipe_context_menu(self, recipe_name, recipe_prompt_from_file, recipe_button, point):
         menu = QMenu(self); recipe_id = (recipe_name, recipe_prompt_from_file) 
@@ -600,20 +781,20 @@ class CoDudeApp(QMainWindow):
         if not self.recipes_file or not os.path.exists(self.recipes_file): return False
         self._backup_recipes_file("before_edit"); 
         try:
-            with open(self.recipes_file, 'r', encoding='utf-8') as f: lines = f.readlines()
             found_and_updated = False; norm_old_name = normalize_whitespace_for_comparison(old_name)
             norm_old_prompt = normalize_whitespace_for_comparison(old_prompt_from_file); updated_lines = []
-            for line_num, line_content in enumerate(lines):
-                stripped_line = line_content.strip()
-                if stripped_line.startswith('**') and ':' in stripped_line:
-                    try:
-                        name_part, prompt_part = stripped_line.split(':', 1); current_line_name = name_part.strip().strip('**').strip(); current_line_prompt = prompt_part.strip()
-                        if normalize_whitespace_for_comparison(current_line_name) == norm_old_name and normalize_whitespace_for_comparison(current_line_prompt) == norm_old_prompt:
-                            newline_char = line_content[len(stripped_line):]; updated_lines.append(f"**{new_name}**: {new_prompt_from_file}{newline_char}"); found_and_updated = True; logging.info(f"Found and replaced recipe on line {line_num+1}"); continue
-                    except Exception as parse_ex: logging.warning(f"Could not parse line {line_num+1} for update check: {stripped_line} - {parse_ex}")
-                updated_lines.append(line_content)
+            with open(self.recipes_file, 'r', encoding='utf-8') as f:
+                for line_num, line_content in enumerate(f): # stream the file; only the rewritten copy is kept
+                    stripped_line = line_content.strip()
+                    if stripped_line.startswith('**') and ':' in stripped_line:
+                        try:
+                            name_part, prompt_part = stripped_line.split(':', 1); current_line_name = name_part.strip().strip('**').strip(); current_line_prompt = prompt_part.strip()
+                            if normalize_whitespace_for_comparison(current_line_name) == norm_old_name and normalize_whitespace_for_comparison(current_line_prompt) == norm_old_prompt:
+                                newline_char = line_content[len(stripped_line):]; updated_lines.append(f"**{new_name}**: {new_prompt_from_file}{newline_char}"); found_and_updated = True; logging.info(f"Found and replaced recipe on line {line_num+1}"); continue
+                        except Exception as parse_ex: logging.warning(f"Could not parse line {line_num+1} for update check: {stripped_line} - {parse_ex}")
+                    updated_lines.append(line_content)
             if found_and_updated:
-                with open(self.recipes_file, 'w', encoding='utf-8') as f: f.writelines(updated_lines); return True
+                self._write_recipes_file(updated_lines); return True
             else: logging.warning(f"Recipe to edit not found: Name='{old_name}', Prompt='{old_prompt_from_file[:50]}...'"); return False
         except Exception as e: logging.error(f"Error updating recipes file: {e}", exc_info=True); return False
 
@@ -627,30 +808,31 @@ class CoDudeApp(QMainWindow):
         else: QMessageBox.critical(self, "Delete Error", f"Failed to delete recipe from {self.recipes_file}.")
 
     def _backup_recipes_file(self, suffix="backup"):
-        if not self.recipes_file or not os.path.exists(self.recipes_file): return
+        if not self.recipes_file: return
         try:
             os.makedirs(BACKUP_DIR, exist_ok=True); timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             base_name = os.path.basename(self.recipes_file); backup_filename = f"{os.path.splitext(base_name)[0]}_{timestamp}_{suffix}.md"
             backup_path = os.path.join(BACKUP_DIR, backup_filename); shutil.copy2(self.recipes_file, backup_path)
             logging.info(f"Recipes file backed up to {backup_path}")
+        except FileNotFoundError: return # nothing to back up yet
         except Exception as e: logging.error(f"Failed to backup recipes file: {e}")
 
     def _remove_recipe_from_file(self, name_to_delete, prompt_to_delete):
         if not self.recipes_file or not os.path.exists(self.recipes_file): return False
         self._backup_recipes_file("before_delete"); 
         try:
-            with open(self.recipes_file, 'r', encoding='utf-8') as f: lines = f.readlines()
             found_and_removed = False; updated_lines = []; norm_name_del = normalize_whitespace_for_comparison(name_to_delete); norm_prompt_del = normalize_whitespace_for_comparison(prompt_to_delete)
-            for line_num, line_content in enumerate(lines):
-                stripped_line = line_content.strip()
-                if stripped_line.startswith('**') and ':' in stripped_line:
-                    try:
-                        name_part, prompt_part = stripped_line.split(':', 1); current_line_name = name_part.strip().strip('**').strip(); current_line_prompt = prompt_part.strip()
-                        if normalize_whitespace_for_comparison(current_line_name) == norm_name_del and normalize_whitespace_for_comparison(current_line_prompt) == norm_prompt_del: found_and_removed = True; logging.info(f"Found and removed recipe on line {line_num+1}"); continue 
-                    except: pass 
-                updated_lines.append(line_content)
+            with open(self.recipes_file, 'r', encoding='utf-8') as f:
+                for line_num, line_content in enumerate(f): # stream the file; only the rewritten copy is kept
+                    stripped_line = line_content.strip()
+                    if stripped_line.startswith('**') and ':' in stripped_line:
+                        try:
+                            name_part, prompt_part = stripped_line.split(':', 1); current_line_name = name_part.strip().strip('**').strip(); current_line_prompt = prompt_part.strip()
+                            if normalize_whitespace_for_comparison(current_line_name) == norm_name_del and normalize_whitespace_for_comparison(current_line_prompt) == norm_prompt_del: found_and_removed = True; logging.info(f"Found and removed recipe on line {line_num+1}"); continue 
+                        except: pass 
+                    updated_lines.append(line_content)
             if found_and_removed:
-                with open(self.recipes_file, 'w', encoding='utf-8') as f: f.writelines(updated_lines); return True
+                self._write_recipes_file(updated_lines); return True
             else: logging.warning(f"Recipe to delete not found: {name_to_delete}"); return False
         except Exception as e: logging.error(f"Error removing recipe from file: {e}", exc_info=True); return False
 
@@ -691,7 +873,7 @@ class CoDudeApp(QMainWindow):
             }
             if not llm_api_config.get("url") and llm_api_config["provider"] == "Local OpenAI-Compatible": QMessageBox.warning(self, "LLM URL Missing", "LLM URL not configured."); return
             if not llm_api_config.get("api_key") and llm_api_config["provider"] == "OpenAI API": QMessageBox.warning(self, "API Key Missing", f"{llm_api_config['provider']} API Key not configured."); return
-        logging.info(f"Executing: '{prompt_from_file_or_custom[:50]}...' (Chat: {is_chat_mode}) with text: '{captured_text[:50]}...'")
+        logging.info("Executing: '%.50s...' (Chat: %s) with text: '%.50s...'", prompt_from_file_or_custom, is_chat_mode, captured_text)
         if button_ref and isinstance(button_ref, QPushButton):
             original_style = button_ref.styleSheet(); highlight_style = "background-color: #90EE90; color: black; text-align: left;"
             button_ref.setStyleSheet(highlight_style); QTimer.singleShot(700, lambda b=button_ref, s=original_style: b.setStyleSheet(s))
@@ -710,14 +892,9 @@ class CoDudeApp(QMainWindow):
 
     def handle_llm_response(self, response_text, captured_text, prompt, is_chat_mode=False):
         logging.info("LLM Response Received"); self.progress_bar.setVisible(False); filename = None
-        if self.permanent_memory and self.memory_dir:
-            try:
-                os.makedirs(self.memory_dir, exist_ok=True); safe_prompt_tag = "".join(c for c in prompt[:25] if c.isalnum() or c in " -_").strip() or "entry"
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S"); filename = f"{safe_prompt_tag}_{timestamp}.md"; file_path = os.path.join(self.memory_dir, filename)
-                memory_content = f"Captured Text:\n{captured_text}\n\nPrompt:\n{prompt}\n\nLLM Response:\n{response_text}"; 
-                with open(file_path, 'w', encoding='utf-8') as f: f.write(memory_content); logging.debug(f"Saved memory entry to {file_path}")
-            except Exception as e: logging.error(f"Error saving permanent memory file: {e}"); filename = None 
-        self._memory.append((captured_text, prompt, response_text, filename)); current_memory_idx = len(self._memory) - 1
+        if self.permanent_memory and self.memory_dir: # the file itself is queued once the response is on screen
+            safe_prompt_tag = _UNSAFE_FILENAME_CHARS_RE.sub('', prompt[:25]).strip() or "entry"; filename = f"{safe_prompt_tag}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+        memory_entry = MemoryEntry(captured_text, prompt, response_text, filename, os.path.join(self.memory_dir, filename) if filename else None); self._memory.append(memory_entry); current_memory_idx = len(self._memory) - 1
         if self.results_in_app:
             formatted_llm_html_content = self.format_markdown_for_display(response_text)
             if is_chat_mode:
@@ -727,10 +904,38 @@ class CoDudeApp(QMainWindow):
             else:
                 if self.append_mode_checkbox.isChecked() and self.results_textedit.toPlainText().strip(): self.results_textedit.append("<hr/>" + formatted_llm_html_content)
                 else: self.results_textedit.setHtml(formatted_llm_html_content)
-            self.results_textedit.moveCursor(QTextCursor.End); self.active_memory_index = current_memory_idx
+            self.results_textedit.setReadOnly(False); self.results_textedit.moveCursor(QTextCursor.End); self.active_memory_index = current_memory_idx
         else: result_window = ResultWindow(response_text, self, current_memory_idx); result_window.show(); self.result_windows.append(result_window)
-        item_text_summary = f"Prompt: {prompt[:25]}... Text: {captured_text[:25]}..."; entry_widget = MemoryEntryWidget(item_text_summary, filename); list_item = QListWidgetItem(self.memory_list); list_item.setSizeHint(entry_widget.sizeHint())
-        entry_widget.delete_button.clicked.connect(partial(self.delete_memory_entry_from_button, list_item)); self.memory_list.setItemWidget(list_item, entry_widget); self.memory_list.scrollToBottom()
+        self._add_memory_list_item(captured_text, prompt, filename); self._trim_memory(); self.memory_list.scrollToBottom()
+        if filename: self.file_writer.write(memory_entry.file_path, f"Captured Text:\n{captured_text}\n\nPrompt:\n{prompt}\n\nLLM Response:\n{response_text}")
+
+    def _memory_response(self, memory_entry):
+        # Entries loaded from permanent memory keep only their preview fields until the response is actually needed
+        if memory_entry.response is None:
+            try:
+                with open(memory_entry.file_path, 'r', encoding='utf-8') as f: parsed_entry = parse_memory_file_content(f.read())
+            except (OSError, ValueError) as e: logging.error(f"Error reading memory file {memory_entry.filename}: {e}"); parsed_entry = None
+            if not parsed_entry: return "" # not cached, so a later access retries the read; response stays None while unreadable
+            memory_entry.response = parsed_entry[2]
+        return memory_entry.response
+
+    def _trim_memory(self):
+        # Evicts the oldest entries past max_memory (<= 0 means unlimited, set under Configure). Files on disk are left alone, and only the newest max_memory are loaded at startup.
+        if self.max_memory <= 0: return
+        evicted_count = 0
+        while len(self._memory) > self.max_memory: self._memory.popleft(); self.memory_list.takeItem(0); evicted_count += 1
+        if not evicted_count: return
+        if self.active_memory_index is not None: self.active_memory_index = self.active_memory_index - evicted_count if self.active_memory_index >= evicted_count else None
+        for window in self.result_windows:
+            if window.memory_index is not None: window.memory_index = window.memory_index - evicted_count if window.memory_index >= evicted_count else None
+        logging.debug("Evicted %d oldest memory entries (max_memory=%d).", evicted_count, self.max_memory)
+
+    def _add_memory_list_item(self, captured_text, prompt, filename, row=None):
+        item_text_summary = f"Prompt: {prompt[:25]}... Text: {captured_text[:25]}..."; entry_widget = MemoryEntryWidget(item_text_summary, filename)
+        list_item = QListWidgetItem(); list_item.setSizeHint(entry_widget.sizeHint())
+        if row is None: self.memory_list.addItem(list_item)
+        else: self.memory_list.insertItem(row, list_item)
+        entry_widget.list_item = list_item; entry_widget.delete_requested.connect(self.on_memory_entry_delete_requested); self.memory_list.setItemWidget(list_item, entry_widget)
 
     def handle_llm_error(self, error_message):
         logging.error(f"LLM Error: {error_message}"); self.progress_bar.setVisible(False); QMessageBox.critical(self, "LLM Error", error_message)
@@ -742,74 +947,96 @@ class CoDudeApp(QMainWindow):
     def show_memory_entry_from_list_item(self, list_widget_item):
         index = self.memory_list.row(list_widget_item)
         if not (0 <= index < len(self._memory)): logging.error(f"Invalid memory index from list item: {index}"); return
-        captured_text, prompt, response_content, filename = self._memory[index]; logging.debug(f"Showing memory entry {index}: Prompt '{prompt[:30]}...'")
+        memory_entry = self._memory[index]
+        if self.results_in_app and index == self.active_memory_index and memory_entry is self._shown_memory_entry and not self.append_mode_checkbox.isChecked(): return # already on screen; re-rendering would only drop unsaved edits
+        captured_text, prompt, response_content = memory_entry.captured_text, memory_entry.prompt, self._memory_response(memory_entry); logging.debug("Showing memory entry %d: Prompt '%.30s...'", index, prompt)
         if self.results_in_app:
-            if self.active_memory_index is not None and self.active_memory_index != index: self.save_memory_content_change(self.active_memory_index, self.results_textedit.toHtml())
-            if response_content.strip().startswith('<'): response_display = response_content # Already HTML
+            if self.active_memory_index is not None and self.active_memory_index != index: self.save_memory_content_change(self.active_memory_index, self._results_html())
+            if memory_entry.response is None: response_display = _UNREADABLE_MEMORY_HTML
+            elif response_content.strip().startswith('<'): response_display = response_content # Already HTML
             else: response_display = self.format_markdown_for_display(response_content) # Render MD
-            full_entry_html = f"""<p><b>Original Captured Text:</b><br/>{self.escape_html_for_manual_construct(captured_text)}</p><p><b>Original Prompt:</b><br/>{self.escape_html_for_manual_construct(prompt)}</p><hr/><p><b>LLM Reply:</b></p>{response_display}"""; self.results_textedit.setHtml(full_entry_html); self.active_memory_index = index; self.results_textedit.moveCursor(QTextCursor.Start)
+            self.results_textedit.setReadOnly(memory_entry.response is None)
+            full_entry_html = f"""<p><b>Original Captured Text:</b><br/>{self.escape_html_for_manual_construct(captured_text)}</p><p><b>Original Prompt:</b><br/>{self.escape_html_for_manual_construct(prompt)}</p><hr/><p><b>LLM Reply:</b></p>{response_display}"""; self.results_textedit.setHtml(full_entry_html); self.active_memory_index = index; self._shown_memory_entry = memory_entry; self.results_textedit.moveCursor(QTextCursor.Start)
         else:
             existing_window = next((win for win in self.result_windows if win.memory_index == index), None)
             if existing_window: existing_window.showNormal(); existing_window.activateWindow()
             else: result_window = ResultWindow(response_content, self, index); result_window.show(); self.result_windows.append(result_window)
 
+    def on_memory_entry_delete_requested(self): self.delete_memory_entry_from_button(self.sender().list_item)
+
     def delete_memory_entry_from_button(self, item_from_list_widget):
-        if self._deleting_memory: return 
+        # A row's delete button acts on the whole selection when that row is part of it
+        selected_items = self.memory_list.selectedItems()
+        self._delete_memory_items(selected_items if item_from_list_widget in selected_items else [item_from_list_widget])
+
+    def delete_selected_memory_entries(self): self._delete_memory_items(self.memory_list.selectedItems())
+
+    def _delete_memory_items(self, list_items):
+        if self._deleting_memory or not list_items: return 
         self._deleting_memory = True
         try:
-            index_to_delete = self.memory_list.row(item_from_list_widget)
-            if not (0 <= index_to_delete < len(self._memory)): logging.error(f"Delete: Invalid memory index {index_to_delete}"); self._deleting_memory = False; return
-            reply = QMessageBox.question(self, "Confirm Deletion", "Delete this memory entry?", QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
-            if reply != QMessageBox.Yes: self._deleting_memory = False; return
-            _, _, _, filename_to_delete = self._memory[index_to_delete]; widget = self.memory_list.itemWidget(item_from_list_widget)
-            if widget and hasattr(widget, 'delete_button'):
-                try: widget.delete_button.clicked.disconnect() 
-                except: pass
-            self.memory_list.takeItem(index_to_delete); self._memory.pop(index_to_delete)
-            if self.permanent_memory and self.memory_dir and filename_to_delete:
-                file_path = os.path.join(self.memory_dir, filename_to_delete)
-                if os.path.exists(file_path):
-                    try: os.remove(file_path); logging.debug(f"Deleted permanent memory file: {file_path}")
-                    except OSError as e: logging.error(f"Error deleting file {file_path}: {e}")
+            rows_to_delete = sorted({row for row in map(self.memory_list.row, list_items) if 0 <= row < len(self._memory)}, reverse=True)
+            if not rows_to_delete: logging.error("Delete: no valid memory entries selected"); return
+            if not self._skip_delete_confirm:
+                confirm_box = QMessageBox(QMessageBox.Question, "Confirm Deletion", "Delete this memory entry?" if len(rows_to_delete) == 1 else f"Delete {len(rows_to_delete)} memory entries?", QMessageBox.Yes | QMessageBox.No, self)
+                confirm_box.setDefaultButton(QMessageBox.No); skip_checkbox = QCheckBox("Don't ask again this session"); confirm_box.setCheckBox(skip_checkbox)
+                if confirm_box.exec_() != QMessageBox.Yes: return
+                self._skip_delete_confirm = skip_checkbox.isChecked()
+            self.memory_list.setUpdatesEnabled(False)
+            try:
+                for index_to_delete in rows_to_delete: # descending, so earlier rows keep their index
+                    path_to_delete = self._memory[index_to_delete].file_path; self.memory_list.takeItem(index_to_delete); del self._memory[index_to_delete]
+                    if self.permanent_memory and path_to_delete: self.file_writer.delete(path_to_delete)
+            finally: self.memory_list.setUpdatesEnabled(True)
             if self.active_memory_index is not None:
-                if self.active_memory_index == index_to_delete: self.active_memory_index = None; 
-                if self.results_in_app: self.results_textedit.clear()
-                elif self.active_memory_index > index_to_delete: self.active_memory_index -= 1
-            logging.debug(f"Memory entry at index {index_to_delete} deleted.")
+                if self.active_memory_index in rows_to_delete:
+                    self.active_memory_index = None
+                    if self.results_in_app: self.results_textedit.clear(); self.results_textedit.setReadOnly(False)
+                else: self.active_memory_index -= sum(1 for row in rows_to_delete if row < self.active_memory_index)
+            for window in self.result_windows:
+                if window.memory_index is None: continue
+                window.memory_index = None if window.memory_index in rows_to_delete else window.memory_index - sum(1 for row in rows_to_delete if row < window.memory_index)
+            logging.debug("Deleted %d memory entries.", len(rows_to_delete))
         except Exception as e: logging.error(f"Error deleting memory entry: {e}", exc_info=True); QMessageBox.critical(self, "Error", f"Failed to delete memory entry: {e}")
         finally: self._deleting_memory = False
 
     def delete_all_memory_entries(self):
         """Delete all memory entries after user confirmation."""
-        if not self._memory:
+        # With permanent memory, every memory file in memory_dir goes too, including older ones max_memory kept out of the list.
+        # Only files that parse as memory files are touched; other .md files in the folder were never entries.
+        memory_paths = {memory_entry.file_path for memory_entry in self._memory if memory_entry.file_path}
+        if self.permanent_memory and self.memory_dir:
+            try:
+                with os.scandir(self.memory_dir) as dir_entries: candidate_paths = [e.path for e in dir_entries if e.name.endswith(".md") and e.is_file() and e.path not in memory_paths]
+            except OSError as e: logging.warning(f"Could not list memory directory {self.memory_dir}: {e}"); candidate_paths = []
+            for candidate_path in candidate_paths:
+                try:
+                    if parse_memory_file_head(candidate_path): memory_paths.add(candidate_path)
+                except (OSError, ValueError) as e: logging.warning(f"Skipping unreadable file {candidate_path}: {e}")
+        else: memory_paths.clear()
+        if not self._memory and not memory_paths:
             QMessageBox.information(self, "No Memory", "There are no memory entries to delete.")
             return
         
+        hidden_count = len(memory_paths) - sum(1 for memory_entry in self._memory if memory_entry.file_path in memory_paths)
+        confirm_text = f"Are you sure you want to delete all {len(self._memory)} listed memory entries"
+        if hidden_count > 0: confirm_text += f" and {hidden_count} older memory files in '{self.memory_dir}' that are not shown"
         reply = QMessageBox.question(self, "Delete All Memory", 
-                                     f"Are you sure you want to delete all {len(self._memory)} memory entries?\n\nThis action cannot be undone.",
+                                     f"{confirm_text}?\n\nThis action cannot be undone.",
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply != QMessageBox.Yes:
             return
         
         try:
             # Delete all files from disk if permanent memory is enabled
-            if self.permanent_memory and self.memory_dir:
-                for cap_text, prompt, response, filename in self._memory:
-                    if filename:
-                        file_path = os.path.join(self.memory_dir, filename)
-                        if os.path.exists(file_path):
-                            try:
-                                os.remove(file_path)
-                                logging.debug(f"Deleted permanent memory file: {file_path}")
-                            except OSError as e:
-                                logging.error(f"Error deleting file {file_path}: {e}")
+            for memory_path in memory_paths: self.file_writer.delete(memory_path)
             
             # Clear the memory lists
             self._memory.clear()
             self.memory_list.clear()
             self.active_memory_index = None
             if self.results_in_app:
-                self.results_textedit.clear()
+                self.results_textedit.clear(); self.results_textedit.setReadOnly(False)
             
             logging.info(f"All memory entries deleted.")
             QMessageBox.information(self, "Delete Complete", "All memory entries have been deleted.")
@@ -817,13 +1044,18 @@ class CoDudeApp(QMainWindow):
             logging.error(f"Error deleting all memory entries: {e}", exc_info=True)
             QMessageBox.critical(self, "Error", f"Failed to delete all memory entries: {e}")
 
-    def on_results_text_changed_by_user(self): pass 
+    def on_results_text_changed_by_user(self): self._results_html_cache = None
+
+    def _results_html(self):
+        # toHtml() walks the whole document; reuse it until the results text changes again
+        if self._results_html_cache is None: self._results_html_cache = self.results_textedit.toHtml()
+        return self._results_html_cache
     
     def focusOutEvent(self, event): 
         if self.results_in_app and self.active_memory_index is not None:
             active_app_window = QApplication.activeWindow(); is_child_dialog = isinstance(active_app_window, QDialog) and active_app_window.parent() == self
             if active_app_window is None or (active_app_window != self and not is_child_dialog and active_app_window not in self.result_windows):
-                logging.debug("Main window focus possibly lost. Saving active memory."); self.save_memory_content_change(self.active_memory_index, self.results_textedit.toHtml())
+                logging.debug("Main window focus possibly lost. Saving active memory."); self.save_memory_content_change(self.active_memory_index, self._results_html())
         super().focusOutEvent(event)
 
     def edit_group_title(self, current_title):
@@ -838,17 +1070,15 @@ class CoDudeApp(QMainWindow):
         if not self.recipes_file or not os.path.exists(self.recipes_file): return False
         self._backup_recipes_file("before_group_edit")
         try:
-            with open(self.recipes_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
             updated_lines = []
-            for line in lines:
-                stripped = line.strip()
-                if stripped.startswith('#') and stripped[1:].strip() == old_title:
-                    updated_lines.append(f"# {new_title}\n")
-                else:
-                    updated_lines.append(line)
-            with open(self.recipes_file, 'w', encoding='utf-8') as f:
-                f.writelines(updated_lines)
+            with open(self.recipes_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    stripped = line.strip()
+                    if stripped.startswith('#') and stripped[1:].strip() == old_title:
+                        updated_lines.append(f"# {new_title}\n")
+                    else:
+                        updated_lines.append(line)
+            self._write_recipes_file(updated_lines)
             return True
         except Exception as e:
             logging.error(f"Error updating group title: {e}")
@@ -865,8 +1095,7 @@ class CoDudeApp(QMainWindow):
                 QMessageBox.Yes | QMessageBox.No)
             if reply == QMessageBox.Yes:
                 self.recipes_file = os.path.join(BASE_PATH, "recipes.md")
-                with open(self.recipes_file, 'w', encoding='utf-8') as f:
-                    f.write(f"# {new_title}\n")
+                self._write_recipes_file([f"# {new_title}\n"])
                 self.load_recipes_and_populate_list()
                 return
             else:
@@ -891,8 +1120,7 @@ class CoDudeApp(QMainWindow):
             # Insert new group
             lines.insert(insert_at, f"# {new_title}\n\n")
             
-            with open(self.recipes_file, 'w', encoding='utf-8') as f:
-                f.writelines(lines)
+            self._write_recipes_file(lines)
                 
             self.load_recipes_and_populate_list()
             return True
@@ -919,8 +1147,7 @@ class CoDudeApp(QMainWindow):
                     QMessageBox.Yes | QMessageBox.No)
                 if reply == QMessageBox.Yes:
                     self.recipes_file = os.path.join(BASE_PATH, "recipes.md")
-                    with open(self.recipes_file, 'w', encoding='utf-8') as f:
-                        f.write(f"# {group_title}\n**{name}**: {prompt}\n")
+                    self._write_recipes_file([f"# {group_title}\n**{name}**: {prompt}\n"])
                     self.load_recipes_and_populate_list()
                     return True
                 else:
@@ -958,8 +1185,7 @@ class CoDudeApp(QMainWindow):
                 # Insert new command
                 lines.insert(insert_at, f"**{name}**: {prompt}\n")
                 
-                with open(self.recipes_file, 'w', encoding='utf-8') as f:
-                    f.writelines(lines)
+                self._write_recipes_file(lines)
                     
                 self.load_recipes_and_populate_list()
                 return True
@@ -1048,8 +1274,7 @@ class CoDudeApp(QMainWindow):
                     # Just append to end
                     updated_lines.extend(recipes_in_group)
 
-            with open(self.recipes_file, 'w', encoding='utf-8') as f:
-                f.writelines(updated_lines)
+            self._write_recipes_file(updated_lines)
 
             self.load_recipes_and_populate_list()
             QMessageBox.information(self, "Success", 
@@ -1063,31 +1288,49 @@ class CoDudeApp(QMainWindow):
 
     def save_memory_content_change(self, memory_idx_to_save, new_html_content):
         if not (0 <= memory_idx_to_save < len(self._memory)): logging.warning(f"Invalid memory index for saving: {memory_idx_to_save}"); return
-        captured_text, prompt, old_response_content, filename = self._memory[memory_idx_to_save]
-        if new_html_content != old_response_content: 
-            self._memory[memory_idx_to_save] = (captured_text, prompt, new_html_content, filename) # Store HTML if edited
-            logging.debug(f"Memory entry {memory_idx_to_save} content updated with new HTML.")
-            if self.permanent_memory and self.memory_dir and filename:
-                file_path = os.path.join(self.memory_dir, filename)
-                try:
-                    disk_content = f"Captured Text:\n{captured_text}\n\nPrompt:\n{prompt}\n\nLLM Response:\n{new_html_content}"; 
-                    with open(file_path, 'w', encoding='utf-8') as f: f.write(disk_content); logging.debug(f"Updated permanent memory file: {file_path} with new HTML.")
-                except Exception as e: logging.error(f"Error saving updated memory to file {file_path}: {e}")
+        memory_entry = self._memory[memory_idx_to_save]; captured_text, prompt = memory_entry.captured_text, memory_entry.prompt
+        if memory_entry.response is None: logging.warning(f"Not saving memory entry {memory_idx_to_save}: its file could not be read."); return # nothing real was shown, so saving would overwrite the reply on disk
+        if new_html_content != memory_entry.response: 
+            memory_entry.response = new_html_content # Store HTML if edited
+            logging.debug("Memory entry %d content updated with new HTML.", memory_idx_to_save)
+            if self.permanent_memory and memory_entry.file_path:
+                disk_content = f"Captured Text:\n{captured_text}\n\nPrompt:\n{prompt}\n\nLLM Response:\n{new_html_content}"
+                self.file_writer.write(memory_entry.file_path, disk_content)
 
     def open_config_window(self):
         try:
-            config_dialog = ConfigWindow(self) 
-            if config_dialog.exec_(): 
-                self.validate_and_load_config(); self.apply_theme(); self.load_recipes_and_populate_list() 
-                self.results_container.setVisible(self.results_in_app)
-                if not self.results_in_app and len(self.splitter_sizes) == 3: self.splitter.setSizes([self.splitter_sizes[0], self.splitter_sizes[1] + self.splitter_sizes[2], 0])
-                else: self.splitter.setSizes(self.splitter_sizes) 
-                self.append_mode_checkbox.setChecked(self.append_mode); self.on_input_mode_changed(self.input_mode_combo.currentText())
-                self.start_hotkey_thread() # Restart hotkey thread
-                logging.debug("Configuration applied after dialog save.")
+            self._flush_config(); self.file_writer.drain(); config_dialog = ConfigWindow(self) # the dialog reads and rewrites config.json itself
+            self.fs_watcher.blockSignals(True) # the dialog's own save is applied below, not via the watcher
+            try: dialog_accepted = config_dialog.exec_()
+            finally: self.fs_watcher.blockSignals(False)
+            if dialog_accepted: self._apply_loaded_config(); logging.debug("Configuration applied after dialog save.")
             else: logging.debug("Config dialog cancelled.")
+            self._update_file_watcher()
         except Exception as e: logging.error(f"Error in open_config_window or applying changes: {e}", exc_info=True); QMessageBox.critical(self, "Configuration Error", f"Failed to apply config changes:\n{e}")
 
+    def _apply_loaded_config(self):
+        self.validate_and_load_config(); self.apply_theme(); self.load_recipes_and_populate_list(); self._trim_memory()
+        self.results_container.setVisible(self.results_in_app); self._apply_splitter_sizes()
+        self.append_mode_checkbox.setChecked(self.append_mode); self.on_input_mode_changed(self.input_mode_combo.currentText())
+        self.start_hotkey_thread() # Restart hotkey thread
+
+    def _update_file_watcher(self):
+        # Editors that save via rename drop the path from the watcher, so re-add whatever is missing
+        wanted_paths = {path for path in (self.recipes_file, CONFIG_FILE) if path and os.path.exists(path)}; watched_paths = set(self.fs_watcher.files())
+        if watched_paths - wanted_paths: self.fs_watcher.removePaths(list(watched_paths - wanted_paths))
+        if wanted_paths - watched_paths: self.fs_watcher.addPaths(list(wanted_paths - watched_paths))
+
+    def on_watched_file_changed(self, path):
+        self._update_file_watcher()
+        if self.recipes_file and os.path.normcase(path) == os.path.normcase(self.recipes_file):
+            logging.debug("Recipes file changed on disk: %s", path); self._recipes_cache = None; self.load_recipes_and_populate_list()
+        elif os.path.normcase(path) == os.path.normcase(CONFIG_FILE):
+            try:
+                disk_config = load_config_cached()
+            except (OSError, ValueError): return # mid-write or broken; the next change notification retries
+            if disk_config == self._config or self.file_writer.is_pending(CONFIG_FILE): return # our own write, or an older one with a newer still queued
+            logging.info("Config file changed on disk; reloading."); self._apply_loaded_config()
+
     def open_recipes_file_externally(self): 
         try:
             recipes_path = self.recipes_file
@@ -1103,13 +1346,14 @@ class CoDudeApp(QMainWindow):
 
     def closeEvent(self, event):
         try:
-            if self.results_in_app and self.active_memory_index is not None: self.save_memory_content_change(self.active_memory_index, self.results_textedit.toHtml())
+            if self.results_in_app and self.active_memory_index is not None: self.save_memory_content_change(self.active_memory_index, self._results_html())
+            self._flush_config()
             for window in self.result_windows[:]: window.close() 
             if self.close_behavior == "Minimize to Tray":
                 event.ignore(); self.hide()
                 for window in self.result_windows[:]:
                     if window and window.isVisible(): window.hide()
-                self.tray_icon.showMessage("CoDude", "CoDude is running in the background.", QSystemTrayIcon.Information, 2000)
+                self._ensure_tray_icon().showMessage("CoDude", "CoDude is running in the background.", QSystemTrayIcon.Information, 2000)
             else: QApplication.instance().quit()
         except Exception as e: logging.error(f"Error in closeEvent: {e}"); event.accept() 
 
@@ -1120,11 +1364,21 @@ class CoDudeApp(QMainWindow):
                     event.ignore(); self.hide()
                     for window in self.result_windows[:]:
                          if window and window.isVisible(): window.hide()
-                    if not self._minimized_by_shortcut: self.tray_icon.showMessage("CoDude", "CoDude minimized to tray.", QSystemTrayIcon.Information, 1500)
+                    if not self._minimized_by_shortcut: self._ensure_tray_icon().showMessage("CoDude", "CoDude minimized to tray.", QSystemTrayIcon.Information, 1500)
                     self._minimized_by_shortcut = False; return 
             super().changeEvent(event)
         except Exception as e: logging.error(f"Error in changeEvent: {e}")
 
+    def _ensure_tray_icon(self):
+        if self.tray_icon is not None: return self.tray_icon
+        self.tray_icon = QSystemTrayIcon(self); tray_qicon = QIcon(ICON_FILE) # bundled via codude.spec datas; resolved from _MEIPASS when frozen
+        self.tray_icon.setIcon(tray_qicon if not tray_qicon.isNull() else self.style().standardIcon(QStyle.SP_ComputerIcon))
+        self.tray_icon.setToolTip("CoDude"); tray_menu = QMenu(self)
+        show_action = QAction("Show/Hide", self); show_action.triggered.connect(self.show_hide_window); tray_menu.addAction(show_action); tray_menu.addSeparator()
+        exit_action = QAction("Exit", self); exit_action.triggered.connect(QApplication.instance().quit); tray_menu.addAction(exit_action)
+        self.tray_icon.setContextMenu(tray_menu); self.tray_icon.activated.connect(self.on_tray_icon_activated); self.tray_icon.show()
+        return self.tray_icon
+
     def on_tray_icon_activated(self, reason):
         if reason == QSystemTrayIcon.Trigger: self.show_hide_window()
 
@@ -1136,7 +1390,7 @@ class CoDudeApp(QMainWindow):
                     if window and not window.isVisible() and not window.isMinimized(): window.showNormal(); window.activateWindow()
                 self._minimized_by_shortcut = False
             else: 
-                if self.results_in_app and self.active_memory_index is not None: self.save_memory_content_change(self.active_memory_index, self.results_textedit.toHtml())
+                if self.results_in_app and self.active_memory_index is not None: self.save_memory_content_change(self.active_memory_index, self._results_html())
                 self.hide()
                 for window in self.result_windows[:]:
                      if window and window.isVisible(): window.hide()
@@ -1144,58 +1398,70 @@ class CoDudeApp(QMainWindow):
             logging.debug("Window visibility toggled.")
         except Exception as e: logging.error(f"Error in show_hide_window: {e}")
 
-    def update_captured_text_area(self, text): self.captured_text_edit.setText(text if text is not None else ""); logging.debug("Captured text updated in text area.")
+    def capture_clipboard_text(self):
+        try:
+            mime = QApplication.clipboard().mimeData()
+            clipboard_text = mime.text()[:_MAX_CAPTURE_CHARS] if mime is not None and mime.hasText() else "" # images/files have no text to send
+        except Exception as e: clipboard_text = ""; logging.error(f"Failed to access clipboard: {e}")
+        logging.debug("Captured text: %.50s", clipboard_text); self.update_captured_text_area(clipboard_text)
+
+    def update_captured_text_area(self, text): self.captured_text_edit.setPlainText(text if text is not None else ""); logging.debug("Captured text updated in text area.")
 
     def export_results_to_markdown(self):
         if not self.results_in_app: QMessageBox.information(self, "Not Applicable", "Export from here is for In-App results."); return
         text_to_export = "";
-        if self.active_memory_index is not None and 0 <= self.active_memory_index < len(self._memory): _, _, raw_llm_response, _ = self._memory[self.active_memory_index]; text_to_export = raw_llm_response
+        if self.active_memory_index is not None and 0 <= self.active_memory_index < len(self._memory): text_to_export = self._memory_response(self._memory[self.active_memory_index])
         else: text_to_export = self.results_textedit.toPlainText() 
         if not text_to_export.strip(): QMessageBox.information(self, "Nothing to Export", "Results area is empty."); return
         options = QFileDialog.Options(); file_path, _ = QFileDialog.getSaveFileName(self, "Save LLM Response", "", "Markdown Files (*.md);;Text Files (*.txt);;All Files (*)", options=options)
         if file_path:
             try:
-                with open(file_path, 'w', encoding='utf-8') as f: f.write(text_to_export)
+                with open(file_path, 'wb') as f: f.write(text_to_export.encode('utf-8'))
                 QMessageBox.information(self, "Export Successful", f"Response saved to {file_path}")
             except Exception as e: QMessageBox.critical(self, "Export Error", f"Could not save file: {e}")
 
     def copy_results_to_clipboard(self):
         if not self.results_in_app: return
-        QApplication.clipboard().setText(self.results_textedit.toHtml())
-        QMessageBox.information(self, "Copy Successful", "HTML content from results area copied.")
+        QApplication.clipboard().setText(self._results_html())
+        self.status_bar.showMessage("HTML content from results area copied.", 2000)
 
     def save_append_mode_state(self): 
         if self.input_mode_combo.currentText() != "Chat Mode:":
             self.append_mode = self.append_mode_checkbox.isChecked(); self._save_partial_config({'append_mode': self.append_mode}); logging.debug(f"Append mode state saved: {self.append_mode}")
 
     def adjust_textarea_font(self, textarea_widget, delta):
-        textarea_id = str(id(textarea_widget)); current_size_pt = self.textarea_font_sizes.get(textarea_id, self.font_size)
+        textarea_id = textarea_widget._font_key; current_size_pt = self.textarea_font_sizes.get(textarea_id, self.font_size)
         new_size_pt = max(8, min(24, current_size_pt + delta))
         font = textarea_widget.font(); font.setPointSize(new_size_pt); textarea_widget.setFont(font)
-        self.textarea_font_sizes[textarea_id] = new_size_pt; self._save_partial_config({'textarea_font_sizes': self.textarea_font_sizes})
-        if textarea_widget == self.results_textedit and textarea_widget.toPlainText(): 
-             current_html = textarea_widget.toHtml(); textarea_widget.setHtml(current_html)
-        logging.debug(f"Adjusted font for textarea {textarea_id} to {new_size_pt}pt.")
+        self.textarea_font_sizes[textarea_id] = new_size_pt; self._schedule_config_save({'textarea_font_sizes': self.textarea_font_sizes}, 300)
+        logging.debug("Adjusted font for textarea %s to %spt.", textarea_id, new_size_pt)
+
+    def _font_up(self): self.adjust_textarea_font(self._font_button_targets[self.sender()], 1)
+
+    def _font_down(self): self.adjust_textarea_font(self._font_button_targets[self.sender()], -1)
 
     def load_permanent_memory_entries(self): 
         if not (self.permanent_memory and self.memory_dir and os.path.exists(self.memory_dir)): return
-        logging.debug(f"Loading permanent memory from {self.memory_dir}"); self._memory.clear(); self.memory_list.clear()
+        logging.debug("Loading permanent memory from %s", self.memory_dir)
+        self.memory_loader_thread = MemoryLoaderThread(self.memory_dir)
+        self.memory_loader_thread.entries_loaded.connect(self.on_permanent_memory_loaded); self.memory_loader_thread.start()
+
+    def on_permanent_memory_loaded(self, entries):
+        # Entries from disk are older than anything added while the loader was running, so they go first
+        if self.max_memory > 0 and len(entries) + len(self._memory) > self.max_memory: # don't build row widgets that _trim_memory would evict straight away
+            entries = entries[len(entries) - max(0, self.max_memory - len(self._memory)):]
+        if not entries: return
+        self.memory_list.setUpdatesEnabled(False)
         try:
-            memory_files = sorted([os.path.join(self.memory_dir, f) for f in os.listdir(self.memory_dir) if f.endswith(".md")], key=os.path.getmtime )
-            for file_path in memory_files:
-                filename = os.path.basename(file_path)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f: content = f.read()
-                    cap_text_m = re.search(r"Captured Text:\n(.*?)\n\nPrompt:", content, re.DOTALL); prompt_m = re.search(r"Prompt:\n(.*?)\n\nLLM Response:", content, re.DOTALL); response_m = re.search(r"LLM Response:\n(.*)", content, re.DOTALL)
-                    if cap_text_m and prompt_m and response_m:
-                        cap_text, prompt, resp = cap_text_m.group(1).strip(), prompt_m.group(1).strip(), response_m.group(1).strip()
-                        self._memory.append((cap_text, prompt, resp, filename)); item_txt = f"Prompt: {prompt[:25]}... Text: {cap_text[:25]}..."
-                        entry_w = MemoryEntryWidget(item_txt, filename); list_i = QListWidgetItem(self.memory_list); list_i.setSizeHint(entry_w.sizeHint())
-                        entry_w.delete_button.clicked.connect(partial(self.delete_memory_entry_from_button, list_i)); self.memory_list.setItemWidget(list_i, entry_w)
-                    else: logging.warning(f"Could not parse memory file: {filename}. Skipping.")
-                except Exception as e_file: logging.error(f"Error processing memory file {filename}: {e_file}")
-            self.memory_list.scrollToBottom(); logging.debug(f"Loaded {len(self._memory)} entries from permanent memory.")
+            for row, memory_entry in enumerate(entries): self._add_memory_list_item(memory_entry.captured_text, memory_entry.prompt, memory_entry.filename, row)
+            self._memory.extendleft(reversed(entries)); loaded_count = len(entries)
+            if self.active_memory_index is not None: self.active_memory_index += loaded_count
+            for window in self.result_windows:
+                if window.memory_index is not None: window.memory_index += loaded_count
+            self._trim_memory()
+            self.memory_list.scrollToBottom(); logging.debug("Loaded %d entries from permanent memory.", loaded_count)
         except Exception as e: logging.error(f"General error loading permanent memory: {e}", exc_info=True)
+        finally: self.memory_list.setUpdatesEnabled(True)
 
 # --- Application Entry Point ---
 def main():
@@ -4,10 +4,12 @@ Handles all configuration file operations, ConfigWindow dialog, and config-relat
 """
 
 import os
+import stat
 import sys
 import json
+import hashlib
 import logging
-from collections import deque
+import threading
 from urllib.parse import urlparse
 
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QComboBox, QCheckBox, 
@@ -15,6 +17,7 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdi
 from PyQt5.QtGui import QIntValidator
 from PyQt5.QtCore import Qt, QTimer
 import requests
+from llm_client import get_session
 
 
 # --- Base Path Detection ---
@@ -33,9 +36,101 @@ BASE_PATH = get_base_path()
 CONFIG_FILE = os.path.join(BASE_PATH, "config.json")
 ABOUT_FILE = os.path.join(BASE_PATH, "Readme.md")
 BACKUP_DIR = os.path.join(BASE_PATH, "backups")
+ICON_FILE = os.path.join(getattr(sys, '_MEIPASS', BASE_PATH), "CoDude_icon.png") # onefile builds extract bundled datas to _MEIPASS, not next to the exe
 APP_VERSION = "0.1.4"
 
 
+# --- Config File Writing ---
+def atomic_write_bytes(path, data, fsync=False, mode=0o666):
+    """Write data to path via a temp file and os.replace, so readers never see a partial file.
+
+    A new file gets mode (less the umask); an existing file keeps its current permissions.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"  # unique per writer, so concurrent saves never share a temp file
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), mode)
+    try:
+        remaining = memoryview(data)
+        while remaining:  # os.write may accept less than everything for very large payloads
+            remaining = remaining[os.write(fd, remaining):]
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+    try:  # os.replace swaps in a new inode, so carry over permissions the user set on the old file (e.g. chmod 600 on config.json)
+        os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+    except FileNotFoundError:
+        pass
+    os.replace(tmp_path, path)
+
+
+# Digest and (mtime_ns, size) of the last config.json we wrote, used to skip identical rewrites
+_last_config_write = None
+_config_write_lock = threading.Lock()
+
+
+# Parsed config.json keyed by (mtime_ns, size), shared by read-only callers
+_config_cache = None
+
+
+def load_config_cached():
+    """Return the parsed config.json, re-reading it only when its mtime or size changed. Treat the result as read-only."""
+    global _config_cache
+    st = os.stat(CONFIG_FILE)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _config_cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with open(CONFIG_FILE, 'rb') as f:
+        data = json.loads(f.read())
+    _config_cache = (key, data)
+    return data
+
+
+def write_config_file(config_data, fsync=False):
+    """Serialize config_data once and write it to CONFIG_FILE atomically, skipping the write if nothing changed."""
+    global _last_config_write, _config_cache
+    data = json.dumps(config_data, indent=4).encode('utf-8')
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    with _config_write_lock:
+        try:
+            st = os.stat(CONFIG_FILE)
+            on_disk = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            on_disk = None
+        if _last_config_write is not None and _last_config_write == (digest, on_disk):
+            logging.debug("Config unchanged, skipping write")
+            return
+        _config_cache = None
+        atomic_write_bytes(CONFIG_FILE, data, fsync=fsync)
+        st = os.stat(CONFIG_FILE)
+        _last_config_write = (digest, (st.st_mtime_ns, st.st_size))
+
+
+# --- ConfigWindow layout helpers ---
+_FIXED_HEIGHT_WIDGETS = (QPushButton, QLineEdit, QComboBox, QCheckBox, QLabel)
+
+
+def _make_row(*widgets_to_add):
+    """Lay widgets out in a tight horizontal row, pinning simple controls to a 22px height."""
+    row = QHBoxLayout()
+    row.setSpacing(5)
+    for w in widgets_to_add:
+        if isinstance(w, QSpacerItem):
+            row.addSpacerItem(w)
+            continue
+        if isinstance(w, _FIXED_HEIGHT_WIDGETS):
+            w.setFixedHeight(22)
+        row.addWidget(w)
+    return row
+
+
+def _make_label(text, parent):
+    """Create a 22px-high QLabel matching the rows built by _make_row."""
+    lbl = QLabel(text, parent)
+    lbl.setFixedHeight(22)
+    return lbl
+
+
 # --- ConfigWindow Dialog ---
 class ConfigWindow(QDialog):
     def __init__(self, parent=None):
@@ -47,77 +142,60 @@ class ConfigWindow(QDialog):
         self.layout.setSpacing(5)
         self.layout.setContentsMargins(10, 10, 10, 10)
         
-        def create_row_layout(*widgets_to_add):
-            row = QHBoxLayout()
-            row.setSpacing(5)
-            for w in widgets_to_add:
-                if isinstance(w, (QPushButton, QLineEdit, QComboBox, QCheckBox, QLabel)):
-                    w.setFixedHeight(22)
-                if isinstance(w, QSpacerItem):
-                    row.addSpacerItem(w)
-                else:
-                    row.addWidget(w)
-            return row
-            
-        def create_label(text):
-            lbl = QLabel(text, self)
-            lbl.setFixedHeight(22)
-            return lbl
-
         # LLM Provider selection
         self.llm_provider_combo = QComboBox(self)
         self.llm_provider_combo.addItems(["Local OpenAI-Compatible", "OpenAI API", "LM Studio Native API"])
         self.llm_provider_combo.currentTextChanged.connect(self.update_llm_fields_visibility)
         self.llm_provider_combo.currentTextChanged.connect(lambda: QTimer.singleShot(100, self.fetch_available_models))
-        self.layout.addLayout(create_row_layout(create_label("LLM Provider:"), self.llm_provider_combo))
+        self.layout.addLayout(_make_row(_make_label("LLM Provider:", self), self.llm_provider_combo))
         
         # Local LLM URL
-        self.llm_url_label = create_label("LLM URL (Local):")
+        self.llm_url_label = _make_label("LLM URL (Local):", self)
         self.llm_url_input = QLineEdit(self)
         self.llm_url_input.setPlaceholderText("e.g., http://localhost:1234")
         self.llm_url_input.textChanged.connect(lambda: QTimer.singleShot(500, self.fetch_available_models))
-        self.llm_url_row = create_row_layout(self.llm_url_label, self.llm_url_input)
+        self.llm_url_row = _make_row(self.llm_url_label, self.llm_url_input)
         self.layout.addLayout(self.llm_url_row)
         
         # Local API Token
-        self.local_api_token_label = create_label("API Token (Optional):")
+        self.local_api_token_label = _make_label("API Token (Optional):", self)
         self.local_api_token_input = QLineEdit(self)
         self.local_api_token_input.setEchoMode(QLineEdit.Password)
         self.local_api_token_input.setToolTip("Optional: Only needed if your local LLM server requires authentication")
-        self.local_api_token_row = create_row_layout(self.local_api_token_label, self.local_api_token_input)
+        self.local_api_token_row = _make_row(self.local_api_token_label, self.local_api_token_input)
         self.layout.addLayout(self.local_api_token_row)
         
         # OpenAI API Key
-        self.openai_api_key_label = create_label("OpenAI API Key:")
+        self.openai_api_key_label = _make_label("OpenAI API Key:", self)
         self.openai_api_key_input = QLineEdit(self)
         self.openai_api_key_input.setEchoMode(QLineEdit.Password)
         self.openai_api_key_input.textChanged.connect(lambda: QTimer.singleShot(500, self.fetch_available_models))
-        self.openai_key_row = create_row_layout(self.openai_api_key_label, self.openai_api_key_input)
+        self.openai_key_row = _make_row(self.openai_api_key_label, self.openai_api_key_input)
         self.layout.addLayout(self.openai_key_row)
         
         # LM Studio URL
-        self.lmstudio_url_label = create_label("LM Studio URL:")
+        self.lmstudio_url_label = _make_label("LM Studio URL:", self)
         self.lmstudio_url_input = QLineEdit(self)
         self.lmstudio_url_input.setPlaceholderText("e.g., http://localhost:1234")
         self.lmstudio_url_input.textChanged.connect(lambda: QTimer.singleShot(500, self.fetch_available_models))
-        self.lmstudio_url_row = create_row_layout(self.lmstudio_url_label, self.lmstudio_url_input)
+        self.lmstudio_url_row = _make_row(self.lmstudio_url_label, self.lmstudio_url_input)
         self.layout.addLayout(self.lmstudio_url_row)
         
         # LM Studio API Key
-        self.lmstudio_api_key_label = create_label("LM Studio API Token:")
+        self.lmstudio_api_key_label = _make_label("LM Studio API Token:", self)
         self.lmstudio_api_key_input = QLineEdit(self)
         self.lmstudio_api_key_input.setEchoMode(QLineEdit.Password)
         self.lmstudio_api_key_input.setToolTip("Optional: Only needed if you have enabled API authentication in LM Studio settings")
         self.lmstudio_api_key_input.textChanged.connect(lambda: QTimer.singleShot(500, self.fetch_available_models))
-        self.lmstudio_api_key_row = create_row_layout(self.lmstudio_api_key_label, self.lmstudio_api_key_input)
+        self.lmstudio_api_key_row = _make_row(self.lmstudio_api_key_label, self.lmstudio_api_key_input)
         self.layout.addLayout(self.lmstudio_api_key_row)
         
         # MCP Plugin IDs
-        self.mcp_plugin_ids_label = create_label("MCP Plugin IDs:")
+        self.mcp_plugin_ids_label = _make_label("MCP Plugin IDs:", self)
         self.mcp_plugin_ids_input = QLineEdit(self)
         self.mcp_plugin_ids_input.setPlaceholderText("e.g., web-search, filesystem")
         self.mcp_plugin_ids_input.setToolTip("Enter comma-separated MCP server IDs (not individual tool names). Example: web-search, filesystem")
-        self.mcp_plugin_ids_row = create_row_layout(self.mcp_plugin_ids_label, self.mcp_plugin_ids_input)
+        self.mcp_plugin_ids_row = _make_row(self.mcp_plugin_ids_label, self.mcp_plugin_ids_input)
         self.layout.addLayout(self.mcp_plugin_ids_row)
         
         # Require USETOOLS checkbox
@@ -129,45 +207,45 @@ class ConfigWindow(QDialog):
         self.model_name_combo = QComboBox(self)
         self.model_name_combo.setEditable(True)
         self.model_name_combo.setToolTip("Select or type a model name. The dropdown shows available models when the provider is accessible.")
-        self.layout.addLayout(create_row_layout(create_label("LLM Model:"), self.model_name_combo))
+        self.layout.addLayout(_make_row(_make_label("LLM Model:", self), self.model_name_combo))
         
         self.layout.addSpacerItem(QSpacerItem(20, 10, QSizePolicy.Minimum, QSizePolicy.Fixed))
         
         # Max recents and favorites
         self.max_recents_input = QLineEdit(self)
         self.max_recents_input.setValidator(QIntValidator(0, 100, self))
-        self.layout.addLayout(create_row_layout(create_label("Max Recent Recipes:"), self.max_recents_input))
+        self.layout.addLayout(_make_row(_make_label("Max Recent Recipes:", self), self.max_recents_input))
         
         self.max_favorites_input = QLineEdit(self)
         self.max_favorites_input.setValidator(QIntValidator(0, 100, self))
-        self.layout.addLayout(create_row_layout(create_label("Max Favorite Recipes:"), self.max_favorites_input))
+        self.layout.addLayout(_make_row(_make_label("Max Favorite Recipes:", self), self.max_favorites_input))
         
         self.layout.addSpacerItem(QSpacerItem(20, 10, QSizePolicy.Minimum, QSizePolicy.Fixed))
         
         # Hotkey Configuration
-        self.layout.addWidget(create_label("Hotkey Configuration:"))
+        self.layout.addWidget(_make_label("Hotkey Configuration:", self))
         self.ctrl_checkbox = QCheckBox("Ctrl", self)
         self.shift_checkbox = QCheckBox("Shift", self)
         self.alt_checkbox = QCheckBox("Alt", self)
-        modifier_layout = create_row_layout(self.ctrl_checkbox, self.shift_checkbox, self.alt_checkbox, 
+        modifier_layout = _make_row(self.ctrl_checkbox, self.shift_checkbox, self.alt_checkbox, 
                                             QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
         self.layout.addLayout(modifier_layout)
         
         self.main_key_input = QLineEdit(self)
         self.main_key_input.setMaxLength(1)
-        self.layout.addLayout(create_row_layout(create_label("Main Hotkey Key:"), self.main_key_input))
+        self.layout.addLayout(_make_row(_make_label("Main Hotkey Key:", self), self.main_key_input))
         
         self.layout.addSpacerItem(QSpacerItem(20, 10, QSizePolicy.Minimum, QSizePolicy.Fixed))
         
         # Theme
         self.theme_combo = QComboBox(self)
         self.theme_combo.addItems(['Light', 'Dark'])
-        self.layout.addLayout(create_row_layout(create_label("Theme:"), self.theme_combo))
+        self.layout.addLayout(_make_row(_make_label("Theme:", self), self.theme_combo))
         
         # Results Display
         self.results_display_combo = QComboBox(self)
         self.results_display_combo.addItems(['Separate Windows', 'In-App Textarea'])
-        self.layout.addLayout(create_row_layout(create_label("Results Display:"), self.results_display_combo))
+        self.layout.addLayout(_make_row(_make_label("Results Display:", self), self.results_display_combo))
         
         # Font Size
         self.font_size_slider = QSlider(Qt.Horizontal, self)
@@ -177,7 +255,7 @@ class ConfigWindow(QDialog):
         self.font_size_slider.setValue(10)
         self.font_size_label = QLabel("Font Size: 10pt")
         self.font_size_slider.valueChanged.connect(lambda v: self.font_size_label.setText(f"Font Size: {v}pt"))
-        self.layout.addLayout(create_row_layout(self.font_size_label, self.font_size_slider))
+        self.layout.addLayout(_make_row(self.font_size_label, self.font_size_slider))
         
         # Permanent Memory
         self.permanent_memory_checkbox = QCheckBox("Enable Permanent Memory", self)
@@ -186,32 +264,38 @@ class ConfigWindow(QDialog):
         # Memory Directory
         self.memory_dir_input = QLineEdit(self)
         self.memory_dir_input.setPlaceholderText(f"e.g., {os.path.join(BASE_PATH, 'memory')}")
-        self.layout.addLayout(create_row_layout(create_label("Memory Directory:"), self.memory_dir_input))
+        self.layout.addLayout(_make_row(_make_label("Memory Directory:", self), self.memory_dir_input))
+        
+        # Max Memory Entries
+        self.max_memory_input = QLineEdit(self)
+        self.max_memory_input.setValidator(QIntValidator(0, 100000, self))
+        self.max_memory_input.setToolTip("Newest entries kept in the memory list, and loaded from the memory directory at startup (0 = unlimited). Older files stay on disk.")
+        self.layout.addLayout(_make_row(_make_label("Max Memory Entries:", self), self.max_memory_input))
         
         # LLM Timeout
         self.timeout_input = QLineEdit(self)
         self.timeout_input.setValidator(QIntValidator(5, 300, self))
-        self.layout.addLayout(create_row_layout(create_label("LLM Timeout (seconds):"), self.timeout_input))
+        self.layout.addLayout(_make_row(_make_label("LLM Timeout (seconds):", self), self.timeout_input))
         
         # Logging Level
         self.logging_combo = QComboBox(self)
         self.logging_combo.addItems(['Minimal', 'Normal', 'Debug'])
-        self.layout.addLayout(create_row_layout(create_label("Logging Level:"), self.logging_combo))
+        self.layout.addLayout(_make_row(_make_label("Logging Level:", self), self.logging_combo))
         
         # Logging Output
         self.logging_output_combo = QComboBox(self)
         self.logging_output_combo.addItems(['Console', 'File', 'Both'])
-        self.layout.addLayout(create_row_layout(create_label("Logging Output:"), self.logging_output_combo))
+        self.layout.addLayout(_make_row(_make_label("Logging Output:", self), self.logging_output_combo))
         
         # Close Behavior
         self.close_behavior_combo = QComboBox(self)
         self.close_behavior_combo.addItems(['Exit', 'Minimize to Tray'])
-        self.layout.addLayout(create_row_layout(create_label("Close Behavior:"), self.close_behavior_combo))
+        self.layout.addLayout(_make_row(_make_label("Close Behavior:", self), self.close_behavior_combo))
         
         # Recipes File
         self.recipes_file_input = QLineEdit(self)
         self.recipes_file_input.setPlaceholderText(f"e.g., {os.path.join(BASE_PATH, 'recipes.md')}")
-        self.layout.addLayout(create_row_layout(create_label("Recipes File:"), self.recipes_file_input))
+        self.layout.addLayout(_make_row(_make_label("Recipes File:", self), self.recipes_file_input))
         
         self.layout.addSpacerItem(QSpacerItem(20, 10, QSizePolicy.Minimum, QSizePolicy.Expanding))
         
@@ -277,7 +361,7 @@ class ConfigWindow(QDialog):
                 headers["Authorization"] = f"Bearer {api_key}"
                 try:
                     logging.debug("Fetching models from OpenAI API...")
-                    response = requests.get("https://api.openai.com/v1/models", headers=headers, timeout=5)
+                    response = get_session().get("https://api.openai.com/v1/models", headers=headers, timeout=5)
                     if response.status_code == 200:
                         data = response.json()
                         models = [m['id'] for m in data.get('data', []) if m.get('id')]
@@ -297,7 +381,7 @@ class ConfigWindow(QDialog):
                 base_url = f"{parsed_url.scheme}://{parsed_url.netloc}" if parsed_url.netloc else url.rstrip('/')
                 try:
                     logging.debug(f"Fetching models from local LLM at {base_url}/v1/models...")
-                    response = requests.get(f"{base_url}/v1/models", headers=headers, timeout=5)
+                    response = get_session().get(f"{base_url}/v1/models", headers=headers, timeout=5)
                     if response.status_code == 200:
                         data = response.json()
                         models = [m['id'] for m in data.get('data', []) if m.get('id')]
@@ -336,7 +420,7 @@ class ConfigWindow(QDialog):
                 for endpoint in endpoints_to_try:
                     try:
                         logging.debug(f"Trying LM Studio endpoint: {endpoint}")
-                        response = requests.get(endpoint, headers=headers, timeout=5)
+                        response = get_session().get(endpoint, headers=headers, timeout=5)
                         logging.debug(f"Response status: {response.status_code}, content length: {len(response.text)}")
                         
                         if response.status_code == 200:
@@ -406,8 +490,7 @@ class ConfigWindow(QDialog):
         try:
             config = {}
             if os.path.exists(CONFIG_FILE):
-                with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+                config = load_config_cached()
             
             self.llm_provider_combo.setCurrentText(config.get("llm_provider", "Local OpenAI-Compatible"))
             self.llm_url_input.setText(config.get("llm_url", "http://127.0.0.1:1234"))
@@ -437,6 +520,7 @@ class ConfigWindow(QDialog):
             self.font_size_slider.setValue(config.get("font_size", 10))
             self.permanent_memory_checkbox.setChecked(config.get("permanent_memory", False))
             self.memory_dir_input.setText(config.get("memory_dir", os.path.join(BASE_PATH, "memory")))
+            self.max_memory_input.setText(str(getattr(self.main_app_ref, "max_memory", 200)))  # the app's already-validated value, not the raw config entry
             self.timeout_input.setText(str(config.get("llm_timeout", 60)))
             self.logging_combo.setCurrentText(config.get("logging_level", "Normal"))
             self.logging_output_combo.setCurrentText(config.get("logging_output", "Both"))
@@ -501,6 +585,7 @@ class ConfigWindow(QDialog):
                 "llm_model_name": self.model_name_combo.currentText().strip() or "gpt-3.5-turbo",
                 "max_recents": int(self.max_recents_input.text() or 5),
                 "max_favorites": int(self.max_favorites_input.text() or 5),
+                "max_memory": int(self.max_memory_input.text() or 200),
                 "recipes_file": self.recipes_file_input.text().strip(),
                 "hotkey": {
                     "ctrl": self.ctrl_checkbox.isChecked(),
@@ -517,18 +602,15 @@ class ConfigWindow(QDialog):
                 "memory_dir": memory_dir_val,
                 "llm_timeout": int(self.timeout_input.text() or 60),
                 "close_behavior": self.close_behavior_combo.currentText(),
-                "group_states": getattr(self.main_app_ref, "_group_states", {}),
+                "group_states": getattr(self.main_app_ref, "_group_states", None) or {},
                 "append_mode": getattr(self.main_app_ref, "append_mode", False),
-                "textarea_font_sizes": getattr(self.main_app_ref, "textarea_font_sizes", {}),
+                "textarea_font_sizes": getattr(self.main_app_ref, "textarea_font_sizes", None) or {},
                 "splitter_sizes": getattr(self.main_app_ref, "splitter_sizes", [250, 350, 300]),
-                "recently_used_recipes": list(getattr(self.main_app_ref, "recently_used_recipes", deque())),
-                "favorite_recipes": getattr(self.main_app_ref, "favorite_recipes", [])
+                "recently_used_recipes": list(getattr(self.main_app_ref, "recently_used_recipes", None) or ()),
+                "favorite_recipes": getattr(self.main_app_ref, "favorite_recipes", None) or []
             }
             
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=4)
-                f.flush()
-                os.fsync(f.fileno())
+            write_config_file(config_data, fsync=True)
             
             QMessageBox.information(self, "Config Saved", "Configuration saved successfully.")
             logging.debug("Config saved successfully")
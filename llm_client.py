@@ -3,11 +3,73 @@
 # Extract this file and place it in the same directory as codude.py
 
 import logging
+import threading
 import requests
 import json
-from urllib.parse import urlparse, urljoin
+from functools import lru_cache
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from PyQt5.QtCore import QThread, pyqtSignal
 
+# orjson is optional; its JSONDecodeError subclasses json.JSONDecodeError, so the except clauses below cover both
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps_bytes = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    def _json_dumps_bytes(obj): return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+# Upper bound on how much of an LLM response body is read into memory
+MAX_RESPONSE_BYTES = 8 * 1024 * 1024
+MAX_ERROR_BYTES = 4096
+
+# Shared session so repeated requests to the same LLM host reuse pooled keep-alive connections
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+
+
+def get_session():
+    """Return the shared requests session, creating and mounting it on first use."""
+    global _HTTP_SESSION
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            session = requests.Session()
+            # Only retry failed connects; a POST that reached the server is never resent, which would start a second generation
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(connect=2, read=0, status=0))
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"Content-Type": "application/json", "User-Agent": "CoDude/1.0"})
+            _HTTP_SESSION = session
+        return _HTTP_SESSION
+
+
+def close_session():
+    """Close the shared session's pooled connections, if one was ever created."""
+    global _HTTP_SESSION
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is not None:
+            _HTTP_SESSION.close()
+            _HTTP_SESSION = None
+
+
+# Endpoint URLs derived from the configured base URL; the same URL is used for every request, so cache them
+@lru_cache(maxsize=16)
+def _local_chat_url(llm_url):
+    """Append /v1/chat/completions to a bare host URL; any URL with a path is used as given."""
+    if urlsplit(llm_url).path.rstrip('/'):
+        return llm_url
+    return f"{llm_url.rstrip('/')}/v1/chat/completions"
+
+
+@lru_cache(maxsize=16)
+def _lmstudio_chat_url(llm_url):
+    """Build the LM Studio native chat endpoint from the scheme and host of llm_url."""
+    parts = urlsplit(llm_url)
+    return f"{parts.scheme}://{parts.netloc}/api/v1/chat"
+
 
 class LLMRequestThread(QThread):
     """Thread for sending requests to LLM and receiving responses"""
@@ -31,6 +93,7 @@ class LLMRequestThread(QThread):
             model_name = self.llm_config.get("model_name", "gpt-3.5-turbo")
             mcp_plugin_ids = self.llm_config.get("mcp_plugin_ids", "")
             user_content = f"{self.prompt}\n\nText: {self.text}" if self.text.strip() else self.prompt
+            self.prompt = self.text = None # the caller keeps its own copies; don't pin large captures for the thread's lifetime
             
             # Check for and strip USETOOLS: keyword from the beginning of prompt
             prompt_has_usetools = False
@@ -39,23 +102,17 @@ class LLMRequestThread(QThread):
                 prompt_has_usetools = True
                 logging.debug("USETOOLS: keyword detected and stripped from prompt")
             
-            headers = {"Content-Type": "application/json"}
+            headers = {} # Content-Type and User-Agent are session defaults; only Authorization varies per provider
             request_url = ""
             
             if provider == "Local OpenAI-Compatible":
                 if not llm_url:
                     self.error_occurred.emit("LLM URL for Local provider not configured.")
                     return
-                parsed_url = urlparse(llm_url)
-                path = parsed_url.path.rstrip('/')
-                if not path or path == '/':
-                    base_url = llm_url.rstrip('/')
-                    request_url = urljoin(f"{base_url}/", 'v1/chat/completions')
+                request_url = _local_chat_url(llm_url)
+                if request_url != llm_url:
                     logging.info(f"Appended '/v1/chat/completions'. Using: {request_url}")
-                elif path.endswith('/v1/chat/completions'):
-                    request_url = llm_url
-                else:
-                    request_url = llm_url
+                elif not urlsplit(llm_url).path.rstrip('/').endswith('/v1/chat/completions'):
                     logging.warning(f"Using provided local URL as is: {request_url}. Ensure it's the correct chat completion endpoint.")
                 if api_key:
                     headers["Authorization"] = f"Bearer {api_key}"
@@ -82,14 +139,12 @@ class LLMRequestThread(QThread):
                 if not llm_url:
                     self.error_occurred.emit("LM Studio URL not configured.")
                     return
-                parsed_url = urlparse(llm_url)
-                base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-                request_url = urljoin(f"{base_url}/", 'api/v1/chat')
+                request_url = _lmstudio_chat_url(llm_url)
                 headers["Authorization"] = f"Bearer {api_key}" if api_key else ""
                 payload = {"model": model_name, "input": user_content}
                 
-                logging.debug(f"MCP plugin IDs raw value: '{mcp_plugin_ids}'")
-                logging.debug(f"require_usetools flag: {self.require_usetools}, prompt_has_usetools: {prompt_has_usetools}")
+                logging.debug("MCP plugin IDs raw value: '%s'", mcp_plugin_ids)
+                logging.debug("require_usetools flag: %s, prompt_has_usetools: %s", self.require_usetools, prompt_has_usetools)
                 
                 should_use_tools = mcp_plugin_ids and mcp_plugin_ids.strip()
                 if self.require_usetools:
@@ -97,7 +152,7 @@ class LLMRequestThread(QThread):
                 
                 if should_use_tools:
                     plugin_list = [p.strip() for p in mcp_plugin_ids.split(',') if p.strip()]
-                    logging.debug(f"Parsed plugin list: {plugin_list}")
+                    logging.debug("Parsed plugin list: %s", plugin_list)
                     if plugin_list:
                         payload["integrations"] = [{"type": "plugin", "id": plugin_id} for plugin_id in plugin_list]
                         logging.info(f"MCP integrations added for LM Studio Native API: {plugin_list}")
@@ -112,16 +167,29 @@ class LLMRequestThread(QThread):
                 self.error_occurred.emit(f"Unsupported LLM provider: {provider}")
                 return
 
-            logging.debug(f"Sending LLM request to {request_url} for provider {provider} with model {model_name}")
-            logging.debug(f"Payload being sent: {json.dumps(payload, indent=2)}")
-            response = requests.post(request_url, json=payload, headers=headers, timeout=self.timeout)
-            raw_response = response.text
+            logging.debug("Sending LLM request to %s for provider %s with model %s", request_url, provider, model_name)
+            if logging.getLogger().isEnabledFor(logging.DEBUG): # skip pretty-printing the whole prompt unless it will be logged
+                logging.debug("Payload being sent: %s", json.dumps(payload, indent=2))
+            with get_session().post(request_url, data=_json_dumps_bytes(payload), headers=headers, timeout=self.timeout, stream=True) as response:
+                read_limit = MAX_RESPONSE_BYTES if response.status_code == 200 else MAX_ERROR_BYTES # error bodies only feed a short message
+                # iter_content (not response.raw) so read timeouts and dropped connections surface as requests exceptions
+                body = bytearray(); too_large = False
+                for chunk in response.iter_content(chunk_size=65536):
+                    body += chunk
+                    if len(body) > read_limit:
+                        too_large = True; del body[read_limit:]; break
+                raw_response = body.decode('utf-8', errors='replace'); body = None # JSON bodies are UTF-8
+            if too_large and response.status_code == 200:
+                logging.error(f"LLM response exceeded {MAX_RESPONSE_BYTES} bytes; discarding it")
+                self.error_occurred.emit(f"LLM response too large (over {MAX_RESPONSE_BYTES // (1024 * 1024)} MiB); try a shorter request or a lower max token setting.")
+                return
+            payload = messages = user_content = None # the request body is no longer needed once the response is in
             
             if response.status_code != 200:
                 logging.error(f"LLM request failed with status {response.status_code}. Response: {raw_response[:500]}...")
                 error_msg = f"LLM request failed (Status: {response.status_code})."
                 try:
-                    error_data = response.json()
+                    error_data = _json_loads(raw_response)
                     if isinstance(error_data, dict) and 'error' in error_data:
                         if isinstance(error_data['error'], dict) and 'message' in error_data['error']:
                             error_msg += f" Message: {error_data['error']['message']}"
@@ -135,8 +203,9 @@ class LLMRequestThread(QThread):
                 self.error_occurred.emit(error_msg)
                 return
 
-            logging.debug(f"Raw LLM success response: {raw_response[:500]}...")
-            result = response.json()
+            logging.debug("Raw LLM success response: %.500s...", raw_response)
+            result = _json_loads(raw_response)
+            raw_response = raw_response[:500] # keep only the glimpse used by the error paths
             if not result:
                 raise ValueError("Empty success response from LLM")
             if not isinstance(result, dict):
@@ -3,9 +3,13 @@ Logger module for CoDude.
 Handles all logging configuration and setup.
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import signal
 import sys
+import threading
 
 # --- Corrected Base Path Detection ---
 def get_base_path():
@@ -26,6 +30,41 @@ def get_base_path():
 BASE_PATH = get_base_path()
 LOG_FILE = os.path.join(BASE_PATH, "codude.log")
 
+_flush_hooks_installed = False
+
+
+def flush_logs():
+    """Flush buffered log records to their targets."""
+    for handler in logging.getLogger().handlers[:]:
+        try: handler.flush()
+        except Exception: pass
+
+
+def _flush_then_chain(previous_handler):
+    """Build a signal handler that flushes the log buffer before the signal's previous behaviour runs."""
+    def handler(signum, frame):
+        flush_logs()
+        if callable(previous_handler):
+            previous_handler(signum, frame)
+        elif previous_handler == signal.SIG_DFL:
+            signal.signal(signum, signal.SIG_DFL)
+            os.kill(os.getpid(), signum)
+    return handler
+
+
+def _install_flush_hooks():
+    """Flush buffered records at interpreter exit and on SIGTERM/SIGINT, once per process."""
+    global _flush_hooks_installed
+    if _flush_hooks_installed:
+        return
+    _flush_hooks_installed = True
+    atexit.register(flush_logs)
+    if threading.current_thread() is not threading.main_thread():
+        return  # signal handlers can only be installed from the main thread
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try: signal.signal(sig, _flush_then_chain(signal.getsignal(sig)))
+        except (OSError, ValueError) as e: print(f"Warning: Could not install log flush handler for {sig}: {e}")
+
 
 def setup_logging(level='Normal', output='Both'):
     """Initialize logging with specified level and output destination."""
@@ -34,23 +73,32 @@ def setup_logging(level='Normal', output='Both'):
         'Extended': logging.INFO, 'Everything': logging.DEBUG
     }
     try:
-        logging.getLogger().handlers = []
         logger = logging.getLogger()
+        for old_handler in logger.handlers[:]:
+            # Flush any buffered records and release the old log file before reconfiguring
+            logger.removeHandler(old_handler)
+            target = getattr(old_handler, 'target', None)
+            old_handler.close()
+            if target is not None: target.close()
         logger.setLevel(levels.get(level, logging.WARNING))
-        logger.handlers = []
-        if output in ['File', 'Both'] and level != 'None':
+        if level == 'None':
+            logger.setLevel(logging.CRITICAL + 1)  # above every level, so isEnabledFor() guards short-circuit and nothing reaches logging.lastResort
+            return  # no handlers to build and no log file to touch
+        if output in ['File', 'Both']:
             log_dir = os.path.dirname(LOG_FILE)
             if log_dir and not os.path.exists(log_dir):
                  try: os.makedirs(log_dir)
                  except OSError as e: print(f"Warning: Could not create log directory {log_dir}: {e}")
             file_handler = logging.FileHandler(filename=LOG_FILE, mode='a', encoding='utf-8')
             file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-            logger.addHandler(file_handler)
-        if output in ['Terminal', 'Both'] and level != 'None':
+            # Buffer DEBUG/INFO file records and write them in batches; a WARNING or worse flushes the buffer immediately
+            logger.addHandler(logging.handlers.MemoryHandler(capacity=256, flushLevel=logging.WARNING, target=file_handler))
+            _install_flush_hooks()
+        if output in ['Terminal', 'Both']:
             console_handler = logging.StreamHandler()
             console_handler.setFormatter(logging.Formatter('%(levelname)s - %(message)s'))
             logger.addHandler(console_handler)
-        if not os.path.exists(LOG_FILE) and level != 'None' and output in ['File', 'Both']:
+        if not os.path.exists(LOG_FILE) and output in ['File', 'Both']:
             try:
                 with open(LOG_FILE, 'a', encoding='utf-8') as f: f.write("")
                 if sys.platform != 'win32':